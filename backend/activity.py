@@ -0,0 +1,173 @@
+"""
+Write-behind activity log.
+
+Routes call `activity_log.record(...)` after a successful commit. Entries are
+pushed onto a bounded in-process queue and a background task flushes them in
+multi-row INSERTs, so logging never adds a database round trip to a request.
+"""
+import asyncio
+import logging
+import os
+import time
+from datetime import datetime
+from typing import Optional
+from sqlalchemy import insert, text, select, func
+from database import engine, AsyncSessionLocal, IS_SQLITE
+from models import ActivityLog
+
+logger = logging.getLogger(__name__)
+
+ACTIVITY_QUEUE_SIZE = int(os.getenv("ACTIVITY_QUEUE_SIZE", "10000"))
+ACTIVITY_BATCH_SIZE = int(os.getenv("ACTIVITY_BATCH_SIZE", "500"))
+ACTIVITY_FLUSH_INTERVAL = float(os.getenv("ACTIVITY_FLUSH_INTERVAL", "1.0"))
+# A flush that starts with entries older than this is reported as lagging.
+ACTIVITY_LAG_WARNING = float(os.getenv("ACTIVITY_LAG_WARNING", "10.0"))
+
+
+def _month_start(value: datetime) -> datetime:
+    return datetime(value.year, value.month, 1)
+
+
+def _next_month(value: datetime) -> datetime:
+    if value.month == 12:
+        return datetime(value.year + 1, 1, 1)
+    return datetime(value.year, value.month + 1, 1)
+
+
+async def ensure_partitions(conn, now: Optional[datetime] = None, months_ahead: int = 1):
+    """Create monthly partitions of activity_log up to `months_ahead` ahead (Postgres only)."""
+    if conn.dialect.name != "postgresql":
+        return
+    await conn.execute(text(
+        "CREATE TABLE IF NOT EXISTS activity_log_default PARTITION OF activity_log DEFAULT"
+    ))
+    start = _month_start(now or datetime.utcnow())
+    for _ in range(months_ahead + 1):
+        end = _next_month(start)
+        await conn.execute(text(f"""
+            CREATE TABLE IF NOT EXISTS activity_log_{start:%Y_%m}
+            PARTITION OF activity_log
+            FOR VALUES FROM ('{start:%Y-%m-%d}') TO ('{end:%Y-%m-%d}')
+        """))
+        start = end
+
+
+class ActivityLogWriter:
+    def __init__(self, session_factory, maxsize: int = ACTIVITY_QUEUE_SIZE, batch_size: int = ACTIVITY_BATCH_SIZE, flush_interval: float = ACTIVITY_FLUSH_INTERVAL):
+        self.session_factory = session_factory
+        self.maxsize = maxsize
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.queue: Optional[asyncio.Queue] = None
+        self._task: Optional[asyncio.Task] = None
+        self._partitioned_month: Optional[datetime] = None
+        self._next_id: Optional[int] = None
+        ### counters exposed through stats()
+        self.written = 0
+        self.dropped = 0
+        self.failed = 0
+        self.last_flush_at: Optional[datetime] = None
+        self.last_lag = 0.0
+
+    def start(self):
+        if self._task is not None:
+            return
+        self.queue = asyncio.Queue(maxsize=self.maxsize)
+        self._task = asyncio.create_task(self._run(), name="activity-log-writer")
+
+    async def stop(self):
+        """Stop the writer after flushing everything still queued."""
+        if self._task is None:
+            return
+        task, self._task = self._task, None
+        # The sentinel sorts behind every pending entry, so the writer drains them first.
+        await self.queue.put(None)
+        await task
+
+    def record(self, action: str, entity_type: str, entity_id: Optional[int] = None, project_id: Optional[int] = None, actor_id: Optional[int] = None, details: Optional[dict] = None):
+        """Queue an entry without blocking. Entries are dropped (and counted) when the queue is full."""
+        if self._task is None:
+            self.dropped += 1
+            return
+        entry = {
+            "created_at": datetime.utcnow(),
+            "project_id": project_id,
+            "actor_id": actor_id,
+            "entity_type": entity_type,
+            "entity_id": entity_id,
+            "action": action,
+            "details": details,
+        }
+        try:
+            self.queue.put_nowait((time.monotonic(), entry))
+        except asyncio.QueueFull:
+            self.dropped += 1
+            if self.dropped == 1 or self.dropped % 1000 == 0:
+                logger.warning("Activity log queue full, %d entries dropped so far", self.dropped)
+
+    def stats(self) -> dict:
+        return {
+            "pending": self.queue.qsize() if self.queue is not None else 0,
+            "capacity": self.maxsize,
+            "written": self.written,
+            "dropped": self.dropped,
+            "failed": self.failed,
+            "last_flush_at": self.last_flush_at,
+            "last_lag_seconds": round(self.last_lag, 3),
+            "running": self._task is not None and not self._task.done(),
+        }
+
+    async def _run(self):
+        stopping = False
+        while not stopping:
+            batch = [await self.queue.get()]
+            # Give the queue a moment to fill so we write full batches under load.
+            deadline = time.monotonic() + self.flush_interval
+            while len(batch) < self.batch_size and batch[-1] is not None:
+                timeout = deadline - time.monotonic()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self.queue.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+            if batch[-1] is None:
+                batch.pop()
+                stopping = True
+            await self._flush(batch)
+
+    async def _flush(self, batch: list):
+        if not batch:
+            return
+        self.last_lag = time.monotonic() - batch[0][0]
+        if self.last_lag > ACTIVITY_LAG_WARNING:
+            logger.warning("Activity log writer is %.1fs behind (%d pending)", self.last_lag, self.queue.qsize())
+        rows = [entry for _, entry in batch]
+        try:
+            month = _month_start(rows[-1]["created_at"])
+            if month != self._partitioned_month:
+                async with engine.begin() as conn:
+                    await ensure_partitions(conn, month)
+                self._partitioned_month = month
+            async with self.session_factory() as session:
+                if IS_SQLITE:
+                    # SQLite cannot auto-increment a composite primary key. This writer
+                    # is the only inserter, so it numbers the rows itself.
+                    if self._next_id is None:
+                        max_result = await session.execute(select(func.max(ActivityLog.id)))
+                        self._next_id = (max_result.scalar() or 0) + 1
+                    for offset, row in enumerate(rows):
+                        row["id"] = self._next_id + offset
+                await session.execute(insert(ActivityLog).values(rows))
+                await session.commit()
+            if IS_SQLITE:
+                self._next_id += len(rows)
+        except Exception:
+            self.failed += len(rows)
+            logger.exception("Failed to write %d activity log entries", len(rows))
+            return
+        self.written += len(rows)
+        self.last_flush_at = datetime.utcnow()
+
+
+activity_log = ActivityLogWriter(AsyncSessionLocal)
@@ -0,0 +1,123 @@
+"""
+Hot/archive tiering for completed tasks.
+
+Tasks that have been Done for more than ARCHIVE_AFTER_DAYS are moved from
+`tasks` into `archived_tasks` in batches, so the hot table and its indexes only
+grow with open and recently finished work.
+"""
+import asyncio
+import logging
+import os
+from datetime import datetime, timedelta
+from typing import Optional
+from sqlalchemy import select, insert, delete, literal
+from database import AsyncSessionLocal
+from models import Task, ArchivedTask, TaskStatus
+from cache import response_cache
+
+logger = logging.getLogger(__name__)
+
+ARCHIVE_AFTER_DAYS = int(os.getenv("ARCHIVE_AFTER_DAYS", "30"))
+ARCHIVE_BATCH_SIZE = int(os.getenv("ARCHIVE_BATCH_SIZE", "1000"))
+ARCHIVE_INTERVAL_SECONDS = float(os.getenv("ARCHIVE_INTERVAL_SECONDS", "3600"))
+
+# Columns copied between the hot and archive tables.
+TASK_COLUMNS = ["id", "title", "description", "status", "due_at", "project_id", "assignee_id", "created_at", "updated_at"]
+
+
+async def archive_batch(db, cutoff: datetime, batch_size: int = ARCHIVE_BATCH_SIZE) -> int:
+    """Move one batch of tasks Done since before `cutoff` into archived_tasks. Returns the number moved."""
+    eligible = [Task.status == TaskStatus.DONE, Task.updated_at < cutoff]
+    # On Postgres the picked rows stay locked until commit, and concurrent archivers skip them.
+    ids_result = await db.execute(
+        select(Task.id, Task.project_id)
+        .where(*eligible)
+        .order_by(Task.updated_at)
+        .limit(batch_size)
+        .with_for_update(skip_locked=True)
+    )
+    rows = ids_result.all()
+    if not rows:
+        return 0
+    ids = [task_id for task_id, _ in rows]
+    archived_at = datetime.utcnow()
+    # Repeat the eligibility check: on SQLite the pick runs on a reader connection, so a task
+    # reopened or edited since then must be left in the hot table.
+    await db.execute(
+        insert(ArchivedTask).from_select(
+            TASK_COLUMNS + ["archived_at"],
+            select(*[getattr(Task, name) for name in TASK_COLUMNS], literal(archived_at)).where(Task.id.in_(ids), *eligible),
+        )
+    )
+    result = await db.execute(delete(Task).where(Task.id.in_(ids), *eligible))
+    await db.commit()
+    await response_cache.invalidate(*{f"project:{project_id}:tasks" for _, project_id in rows})
+    return result.rowcount
+
+async def restore_task(db, archived: ArchivedTask):
+    """Move an archived task back into the hot table. The caller commits."""
+    # Touch updated_at so the next archiver run does not move it straight back.
+    await db.execute(
+        insert(Task).from_select(
+            TASK_COLUMNS,
+            select(*[getattr(ArchivedTask, name) for name in TASK_COLUMNS if name != "updated_at"], literal(datetime.utcnow()))
+            .where(ArchivedTask.id == archived.id),
+        )
+    )
+    await db.execute(delete(ArchivedTask).where(ArchivedTask.id == archived.id))
+
+
+class TaskArchiver:
+    def __init__(self, session_factory, after_days: int = ARCHIVE_AFTER_DAYS, batch_size: int = ARCHIVE_BATCH_SIZE, interval: float = ARCHIVE_INTERVAL_SECONDS):
+        self.session_factory = session_factory
+        self.after_days = after_days
+        self.batch_size = batch_size
+        self.interval = interval
+        self._task: Optional[asyncio.Task] = None
+        self.archived = 0
+        self.last_run_at: Optional[datetime] = None
+
+    def start(self):
+        if self._task is not None or self.after_days <= 0:
+            return
+        self._task = asyncio.create_task(self._run(), name="task-archiver")
+
+    async def stop(self):
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+    async def run_once(self) -> int:
+        """Archive every eligible task, one committed batch at a time."""
+        cutoff = datetime.utcnow() - timedelta(days=self.after_days)
+        moved = 0
+        while True:
+            # A fresh session per batch keeps the identity map and transaction short.
+            async with self.session_factory() as db:
+                count = await archive_batch(db, cutoff, self.batch_size)
+            moved += count
+            if count < self.batch_size:
+                break
+            # Let request handlers in between batches.
+            await asyncio.sleep(0)
+        self.archived += moved
+        self.last_run_at = datetime.utcnow()
+        if moved:
+            logger.info("Archived %d tasks done before %s", moved, cutoff)
+        return moved
+
+    async def _run(self):
+        while True:
+            try:
+                await self.run_once()
+            except Exception:
+                logger.exception("Task archiver run failed")
+            await asyncio.sleep(self.interval)
+
+
+task_archiver = TaskArchiver(AsyncSessionLocal)
@@ -72,7 +72,7 @@ async def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(s
             db = session
             break
     
-    result = await db.execute(select(User).where(User.id == user_id))
+    result = await db.execute(select(User).where(User.id == user_id, User.deleted_at.is_(None)))
     current_user = result.scalar_one_or_none()
     if current_user is None:
         raise HTTPException(
@@ -95,7 +95,7 @@ async def get_current_user_with_db(db: AsyncSession = Depends(get_db), credentia
     
     user_id = int(user_id_str)
     
-    result = await db.execute(select(User).where(User.id == user_id))
+    result = await db.execute(select(User).where(User.id == user_id, User.deleted_at.is_(None)))
     current_user = result.scalar_one_or_none()
     if current_user is None:
         raise HTTPException(
@@ -0,0 +1,76 @@
+"""
+In-process API benchmark.
+
+Runs the whole app against an embedded SQLite database (no server, no Postgres),
+seeds a project and times the main read and write endpoints:
+
+    python benchmark.py [--tasks 2000] [--requests 200]
+
+Set DATABASE_URL to benchmark another database instead.
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import time
+
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+os.environ.setdefault("SQL_ECHO", "false")
+
+import httpx
+from main import app
+
+
+async def timed(client, method, url, count, **kwargs):
+    samples = []
+    for _ in range(count):
+        start = time.perf_counter()
+        response = await client.request(method, url, **kwargs)
+        samples.append((time.perf_counter() - start) * 1000)
+        response.raise_for_status()
+    samples.sort()
+    return {
+        "p50": statistics.median(samples),
+        "p95": samples[int(len(samples) * 0.95) - 1],
+        "max": samples[-1],
+    }
+
+
+async def run_benchmark(task_count: int, request_count: int):
+    async with app.router.lifespan_context(app):
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://benchmark") as client:
+            registered = await client.post("/users/register", json={"name": "Bench", "username": "bench", "email": "bench@example.com", "password": "bench"})
+            registered.raise_for_status()
+            headers = {"Authorization": f"Bearer {registered.json()['access_token']}"}
+            user_id = registered.json()["user_id"]
+
+            start = time.perf_counter()
+            project = await client.post("/projects/", json={"name": "Bench"}, headers=headers)
+            project.raise_for_status()
+            project_id = project.json()["id"]
+            for i in range(task_count):
+                await client.post(f"/tasks/{project_id}/tasks/", json={"title": f"Task {i}", "description": "x" * 200, "assignee_id": user_id}, headers=headers)
+            print(f"seeded {task_count} tasks in {time.perf_counter() - start:.2f}s")
+
+            results = {
+                "POST /tasks": await timed(client, "POST", f"/tasks/{project_id}/tasks/", request_count, json={"title": "New"}, headers=headers),
+                "GET /users/{id}": await timed(client, "GET", f"/users/{user_id}", request_count),
+                "GET /projects/{id}": await timed(client, "GET", f"/projects/{project_id}", request_count, headers=headers),
+                "GET /projects/{id}/bootstrap": await timed(client, "GET", f"/projects/{project_id}/bootstrap", request_count, headers=headers),
+                "GET /tasks (sparse)": await timed(client, "GET", f"/tasks/{project_id}/tasks/?fields=id,title,status", request_count),
+                "GET /tasks/overdue": await timed(client, "GET", "/tasks/overdue", request_count, headers=headers),
+                "POST /projects/{id}/clone": await timed(client, "POST", f"/projects/{project_id}/clone", 5, json={}, headers=headers),
+            }
+
+    print(f"{'endpoint':<32}{'p50 ms':>10}{'p95 ms':>10}{'max ms':>10}")
+    for name, stats in results.items():
+        print(f"{name:<32}{stats['p50']:>10.2f}{stats['p95']:>10.2f}{stats['max']:>10.2f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--tasks", type=int, default=2000)
+    parser.add_argument("--requests", type=int, default=200)
+    args = parser.parse_args()
+    asyncio.run(run_benchmark(args.tasks, args.requests))
@@ -0,0 +1,142 @@
+"""
+Tag-based response cache.
+
+Read routes store their serialized JSON body under a key and tag it with every
+entity it includes (`user:<id>`, `project:<id>`, `project:<id>:tasks`). Write
+routes call `invalidate()` with the tags they touch after committing.
+
+Cached bodies must not depend on who is asking: routes run their authorization
+check on every request *before* looking in the cache, and a response that does
+vary by caller must put the caller's id in its key.
+
+The default backend is an in-process LRU bounded by total bytes, which is only
+coherent with a single worker. Other backends (e.g. a shared Redis) can be
+plugged in by implementing `CacheBackend`.
+"""
+import os
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Iterable, Optional, Set, Tuple
+from fastapi import Response
+from pydantic import TypeAdapter
+
+RESPONSE_CACHE_MAX_BYTES = int(os.getenv("RESPONSE_CACHE_MAX_BYTES", str(64 * 1024 * 1024)))
+RESPONSE_CACHE_MAX_ENTRY_BYTES = int(os.getenv("RESPONSE_CACHE_MAX_ENTRY_BYTES", str(1024 * 1024)))
+# Safety net for writes that bypass the API (scripts, manual SQL).
+RESPONSE_CACHE_TTL = float(os.getenv("RESPONSE_CACHE_TTL", "300"))
+
+
+class CacheBackend:
+    async def get(self, key: str) -> Optional[bytes]:
+        raise NotImplementedError
+
+    async def set(self, key: str, value: bytes, tags: Iterable[str], generation: int):
+        """Store `value` unless an invalidation happened since `generation` was read."""
+        raise NotImplementedError
+
+    async def invalidate(self, tags: Iterable[str]):
+        raise NotImplementedError
+
+    async def generation(self) -> int:
+        raise NotImplementedError
+
+    async def clear(self):
+        raise NotImplementedError
+
+
+class LRUCacheBackend(CacheBackend):
+    def __init__(self, max_bytes: int = RESPONSE_CACHE_MAX_BYTES, max_entry_bytes: int = RESPONSE_CACHE_MAX_ENTRY_BYTES, ttl: float = RESPONSE_CACHE_TTL):
+        self.max_bytes = max_bytes
+        self.max_entry_bytes = max_entry_bytes
+        self.ttl = ttl
+        # key -> (value, tags, expires_at)
+        self._entries: "OrderedDict[str, Tuple[bytes, Tuple[str, ...], float]]" = OrderedDict()
+        self._tags: Dict[str, Set[str]] = {}
+        self._generation = 0
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    async def get(self, key: str) -> Optional[bytes]:
+        entry = self._entries.get(key)
+        if entry is None or entry[2] < time.monotonic():
+            if entry is not None:
+                self._remove(key)
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return entry[0]
+
+    async def set(self, key: str, value: bytes, tags: Iterable[str], generation: int):
+        # A write committed while this response was being built may not be reflected in it.
+        if generation != self._generation or len(value) > self.max_entry_bytes:
+            return
+        if key in self._entries:
+            self._remove(key)
+        tags = tuple(tags)
+        self._entries[key] = (value, tags, time.monotonic() + self.ttl)
+        self.size += len(value)
+        for tag in tags:
+            self._tags.setdefault(tag, set()).add(key)
+        while self.size > self.max_bytes:
+            self._remove(next(iter(self._entries)))
+            self.evictions += 1
+
+    async def invalidate(self, tags: Iterable[str]):
+        self._generation += 1
+        for tag in tags:
+            for key in self._tags.pop(tag, ()):
+                if key in self._entries:
+                    self._remove(key)
+
+    async def generation(self) -> int:
+        return self._generation
+
+    async def clear(self):
+        self._generation += 1
+        self._entries.clear()
+        self._tags.clear()
+        self.size = 0
+
+    def _remove(self, key: str):
+        value, tags, _ = self._entries.pop(key)
+        self.size -= len(value)
+        for tag in tags:
+            keys = self._tags.get(tag)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._tags[tag]
+
+
+class ResponseCache:
+    def __init__(self, backend: CacheBackend):
+        self.backend = backend
+        self._adapters: Dict[Any, TypeAdapter] = {}
+
+    async def generation(self) -> int:
+        """Read before querying the database; pass to `put()`."""
+        return await self.backend.generation()
+
+    async def get(self, key: str) -> Optional[Response]:
+        body = await self.backend.get(key)
+        if body is None:
+            return None
+        return Response(content=body, media_type="application/json")
+
+    async def put(self, key: str, schema: Any, obj: Any, tags: Iterable[str], generation: int) -> Response:
+        """Serialize `obj` with the response schema, cache it under `key` and return it."""
+        adapter = self._adapters.get(schema)
+        if adapter is None:
+            adapter = self._adapters[schema] = TypeAdapter(schema)
+        body = adapter.dump_json(adapter.validate_python(obj, from_attributes=True))
+        await self.backend.set(key, body, tags, generation)
+        return Response(content=body, media_type="application/json")
+
+    async def invalidate(self, *tags: str):
+        await self.backend.invalidate(tags)
+
+
+response_cache = ResponseCache(LRUCacheBackend())
@@ -0,0 +1,113 @@
+"""
+Set-based copying for project cloning and templates.
+
+Each copy is a single INSERT ... SELECT, so cloning a project costs a handful
+of statements however many tasks it has; no rows pass through Python.
+"""
+from datetime import datetime
+from sqlalchemy import select, insert, literal, cast, null, exists, case, or_, Integer
+from models import Task, ProjectMember, TemplateTask, TemplateMember, TaskStatus, ProjectRole, User
+
+
+async def copy_rows(db, target, source, where: list, values: dict) -> int:
+    """INSERT INTO target (values' keys) SELECT values' expressions FROM source WHERE where. Returns the row count."""
+    query = select(*values.values()).where(*where).order_by(source.id)
+    result = await db.execute(insert(target).from_select(list(values), query))
+    return result.rowcount
+
+
+def _status(source_status, reset_status: bool):
+    return literal(TaskStatus.TODO, Task.status.type) if reset_status else source_status
+
+
+def _assignee(source_assignee, include_members: bool):
+    return source_assignee if include_members else cast(null(), Integer)
+
+
+def _assignee_with_access(source_assignee, include_members: bool, project_id: int, owner_id: int):
+    """Keep an assignee only if they own or belong to the new project, so copy its members first."""
+    if not include_members:
+        return cast(null(), Integer)
+    has_access = or_(
+        source_assignee == owner_id,
+        exists().where(ProjectMember.project_id == project_id, ProjectMember.user_id == source_assignee),
+    )
+    return case((has_access, source_assignee), else_=cast(null(), Integer))
+
+
+def _member_is_live(source):
+    # Memberships of users marked deleted are left behind.
+    return exists().where(User.id == source.user_id, User.deleted_at.is_(None))
+
+
+async def copy_project_tasks(db, source_id: int, target_id: int, owner_id: int, include_members: bool, reset_status: bool) -> int:
+    now = datetime.utcnow()
+    return await copy_rows(db, Task, Task, [Task.project_id == source_id], {
+        "title": Task.title,
+        "description": Task.description,
+        "status": _status(Task.status, reset_status),
+        "project_id": literal(target_id),
+        "assignee_id": _assignee_with_access(Task.assignee_id, include_members, target_id, owner_id),
+        "created_at": literal(now),
+        "updated_at": literal(now),
+    })
+
+
+async def copy_project_members(db, source_id: int, target_id: int, owner_id: int, source_owner_id: int) -> int:
+    """Copy memberships, skipping the new project's owner. A source owner who is not the new owner joins as admin."""
+    now = datetime.utcnow()
+    count = await copy_rows(db, ProjectMember, ProjectMember, [ProjectMember.project_id == source_id, ProjectMember.user_id != owner_id, _member_is_live(ProjectMember)], {
+        "project_id": literal(target_id),
+        "user_id": ProjectMember.user_id,
+        "role": ProjectMember.role,
+        "joined_at": literal(now),
+    })
+    if source_owner_id != owner_id:
+        await db.execute(insert(ProjectMember).values(project_id=target_id, user_id=source_owner_id, role=ProjectRole.ADMIN, joined_at=now))
+        count += 1
+    return count
+
+
+async def save_template_tasks(db, project_id: int, template_id: int, include_members: bool) -> int:
+    return await copy_rows(db, TemplateTask, Task, [Task.project_id == project_id], {
+        "template_id": literal(template_id),
+        "title": Task.title,
+        "description": Task.description,
+        "status": Task.status,
+        "assignee_id": _assignee(Task.assignee_id, include_members),
+    })
+
+
+async def save_template_members(db, project_id: int, template_id: int, owner_id: int, source_owner_id: int) -> int:
+    """Snapshot memberships. As in copy_project_members, a source owner who is not the template owner is kept as admin."""
+    count = await copy_rows(db, TemplateMember, ProjectMember, [ProjectMember.project_id == project_id, _member_is_live(ProjectMember)], {
+        "template_id": literal(template_id),
+        "user_id": ProjectMember.user_id,
+        "role": ProjectMember.role,
+    })
+    if source_owner_id != owner_id:
+        await db.execute(insert(TemplateMember).values(template_id=template_id, user_id=source_owner_id, role=ProjectRole.ADMIN))
+        count += 1
+    return count
+
+
+async def instantiate_template_tasks(db, template_id: int, project_id: int, owner_id: int, include_members: bool, reset_status: bool) -> int:
+    now = datetime.utcnow()
+    return await copy_rows(db, Task, TemplateTask, [TemplateTask.template_id == template_id], {
+        "title": TemplateTask.title,
+        "description": TemplateTask.description,
+        "status": _status(TemplateTask.status, reset_status),
+        "project_id": literal(project_id),
+        "assignee_id": _assignee_with_access(TemplateTask.assignee_id, include_members, project_id, owner_id),
+        "created_at": literal(now),
+        "updated_at": literal(now),
+    })
+
+
+async def instantiate_template_members(db, template_id: int, project_id: int, owner_id: int) -> int:
+    return await copy_rows(db, ProjectMember, TemplateMember, [TemplateMember.template_id == template_id, TemplateMember.user_id != owner_id, _member_is_live(TemplateMember)], {
+        "project_id": literal(project_id),
+        "user_id": TemplateMember.user_id,
+        "role": TemplateMember.role,
+        "joined_at": literal(datetime.utcnow()),
+    })
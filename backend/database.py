@@ -1,29 +1,104 @@
+from sqlalchemy import event
 from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
-from sqlalchemy.orm import sessionmaker, declarative_base
+from sqlalchemy.orm import sessionmaker, declarative_base, Session
+from sqlalchemy.sql import Insert, Update, Delete
+import atexit
 import os
+import tempfile
 from dotenv import load_dotenv
 
 load_dotenv()
 
-DATABASE_URL = os.getenv("DATABASE_URL")
+# Without DATABASE_URL, fall back to an embedded SQLite file next to the app.
+DATABASE_URL = os.getenv("DATABASE_URL", "sqlite+aiosqlite:///./taskmanager.db")
 
 # Convert postgresql:// to postgresql+asyncpg:// for async support
 if DATABASE_URL and DATABASE_URL.startswith("postgresql://"):
     DATABASE_URL = DATABASE_URL.replace("postgresql://", "postgresql+asyncpg://", 1)
 
+# Same for sqlite:// -> sqlite+aiosqlite://
+if DATABASE_URL.startswith("sqlite://"):
+    DATABASE_URL = DATABASE_URL.replace("sqlite://", "sqlite+aiosqlite://", 1)
+
+IS_SQLITE = DATABASE_URL.startswith("sqlite")
+SQLITE_READERS = int(os.getenv("SQLITE_READERS", "4"))
+SQL_ECHO = os.getenv("SQL_ECHO", "true").lower() in ("1", "true", "yes")
+# Connection pool bounds (SQLAlchemy's defaults). On SQLite the read pool uses SQLITE_READERS instead of POOL_SIZE.
+POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "5"))
+POOL_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "10"))
+
+# A true :memory: database lives inside a single connection, which the background
+# workers and concurrent sessions would have to share. Use a throwaway file instead,
+# on tmpfs where available, so the reader/writer layout below still applies.
+if IS_SQLITE and (DATABASE_URL.endswith(":memory:") or DATABASE_URL.endswith("://")):
+    _fd, _path = tempfile.mkstemp(suffix=".db", dir="/dev/shm" if os.path.isdir("/dev/shm") else None)
+    os.close(_fd)
+    DATABASE_URL = f"sqlite+aiosqlite:///{_path}"
+
+    @atexit.register
+    def _remove_temp_database():
+        for suffix in ("", "-wal", "-shm"):
+            if os.path.exists(_path + suffix):
+                os.remove(_path + suffix)
+
 # Shared declarative base for all models in the project. Import this Base
 # from other modules so that metadata.create_all() sees every model.
 Base = declarative_base()
 
-engine = create_async_engine(DATABASE_URL, echo=True, future=True)
+if not IS_SQLITE:
+    engine = create_async_engine(DATABASE_URL, echo=SQL_ECHO, future=True, pool_size=POOL_SIZE, max_overflow=POOL_MAX_OVERFLOW)
+    read_engine = engine
+else:
+    # SQLite allows one writer at a time: give writes a single pooled connection so they
+    # queue in the pool instead of failing with "database is locked". Under WAL, readers
+    # never block the writer, so reads get their own pool of connections.
+    engine = create_async_engine(DATABASE_URL, echo=SQL_ECHO, future=True, pool_size=1, max_overflow=0)
+    read_engine = create_async_engine(DATABASE_URL, echo=SQL_ECHO, future=True, pool_size=SQLITE_READERS, max_overflow=POOL_MAX_OVERFLOW)
+
+    def _set_sqlite_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        cursor.execute("PRAGMA journal_mode=WAL")
+        # Durable at checkpoints rather than every commit; safe with WAL.
+        cursor.execute("PRAGMA synchronous=NORMAL")
+        cursor.execute("PRAGMA mmap_size=268435456")
+        cursor.execute("PRAGMA foreign_keys=ON")
+        cursor.execute("PRAGMA busy_timeout=5000")
+        cursor.execute("PRAGMA cache_size=-64000")
+        cursor.execute("PRAGMA temp_store=MEMORY")
+        cursor.close()
+
+    event.listen(engine.sync_engine, "connect", _set_sqlite_pragmas)
+    event.listen(read_engine.sync_engine, "connect", _set_sqlite_pragmas)
+
+# Most connections reads can hold at once.
+READ_POOL_CAPACITY = (SQLITE_READERS if IS_SQLITE else POOL_SIZE) + POOL_MAX_OVERFLOW
+
+
+class RoutingSession(Session):
+    """Send writes (and everything after them in the same transaction) to `engine`, other reads to `read_engine`."""
+
+    _wrote = False
+
+    def get_bind(self, mapper=None, clause=None, **kw):
+        if self._wrote or self._flushing or isinstance(clause, (Insert, Update, Delete)):
+            self._wrote = True
+            return engine.sync_engine
+        return read_engine.sync_engine
+
+
+@event.listens_for(RoutingSession, "after_transaction_end")
+def _reset_write_routing(session, transaction):
+    if transaction.parent is None:
+        session._wrote = False
+
 
 AsyncSessionLocal = sessionmaker(
     bind=engine,
     class_=AsyncSession,
+    sync_session_class=RoutingSession,
     expire_on_commit=False
 )
 
 async def get_db():
     async with AsyncSessionLocal() as session:
         yield session
-        
\ No newline at end of file
@@ -0,0 +1,113 @@
+"""
+Sparse fieldsets and relation expansion for read routes.
+
+`?fields=id,title,status` limits both the columns loaded from the database
+(via `load_only`) and the keys in the response. `?expand=assignee` loads and
+embeds a related object. Without either parameter a route keeps its full
+response shape.
+"""
+from typing import Any, Dict, List, Optional, Tuple
+from fastapi import HTTPException, status
+from fastapi.encoders import jsonable_encoder
+from sqlalchemy.orm import load_only, selectinload
+from pydantic import TypeAdapter
+from models import Task, Project, ProjectMember, User
+from schemas import UserSimple, ProjectMemberResponse
+
+# Embedded users are always serialized as UserSimple; skip email and password hash.
+USER_SIMPLE_COLUMNS = (User.id, User.username, User.name)
+
+
+class Expansion:
+    def __init__(self, relationship, schema, foreign_key: Optional[str] = None, nested=None):
+        self.relationship = relationship
+        self.adapter = TypeAdapter(schema)
+        # Column that must be loaded for the relationship to be resolved.
+        self.foreign_key = foreign_key
+        self.nested = nested
+
+    def loader(self):
+        option = selectinload(self.relationship)
+        if self.nested is not None:
+            return option.selectinload(self.nested).load_only(*USER_SIMPLE_COLUMNS)
+        if self.relationship.property.mapper.class_ is User:
+            return option.load_only(*USER_SIMPLE_COLUMNS)
+        return option
+
+
+class Selection:
+    def __init__(self, fields: Tuple[str, ...], expand: Tuple[str, ...]):
+        self.fields = fields
+        self.expand = expand
+
+    def cache_suffix(self) -> str:
+        return f"?fields={','.join(self.fields)}&expand={','.join(self.expand)}"
+
+
+class FieldSet:
+    def __init__(self, model, fields: List[str], expansions: Dict[str, Expansion]):
+        self.model = model
+        self.fields = fields
+        self.expansions = expansions
+
+    def parse(self, fields: Optional[str], expand: Optional[str]) -> Optional[Selection]:
+        """Validate the query parameters. Returns None when neither was given."""
+        if fields is None and expand is None:
+            return None
+        selected = self._split(fields, self.fields, "field") if fields is not None else list(self.fields)
+        expanded = self._split(expand, list(self.expansions), "expansion") if expand is not None else []
+        # Keep the declared order so equivalent requests share a cache key.
+        return Selection(
+            tuple(name for name in self.fields if name in selected or name == "id"),
+            tuple(name for name in self.expansions if name in expanded),
+        )
+
+    def options(self, selection: Selection) -> list:
+        columns = set(selection.fields)
+        for name in selection.expand:
+            if self.expansions[name].foreign_key is not None:
+                columns.add(self.expansions[name].foreign_key)
+        options = [load_only(*[getattr(self.model, name) for name in self.fields if name in columns])]
+        options.extend(self.expansions[name].loader() for name in selection.expand)
+        return options
+
+    def dump(self, selection: Selection, obj: Any) -> dict:
+        data = {name: getattr(obj, name) for name in selection.fields}
+        for name in selection.expand:
+            adapter = self.expansions[name].adapter
+            value = getattr(obj, name)
+            data[name] = None if value is None else adapter.dump_python(adapter.validate_python(value, from_attributes=True), mode="json")
+        return jsonable_encoder(data)
+
+    @staticmethod
+    def _split(raw: str, allowed: List[str], kind: str) -> List[str]:
+        names = [name.strip() for name in raw.split(",") if name.strip()]
+        unknown = [name for name in names if name not in allowed]
+        if unknown:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Unknown {kind}(s): {', '.join(unknown)}. Allowed: {', '.join(allowed)}"
+            )
+        return names
+
+
+TASK_FIELDS = FieldSet(
+    Task,
+    ["id", "title", "description", "status", "assignee_id", "due_at", "project_id", "created_at", "updated_at"],
+    {"assignee": Expansion(Task.assignee, Optional[UserSimple], foreign_key="assignee_id")},
+)
+
+PROJECT_FIELDS = FieldSet(
+    Project,
+    ["id", "name", "description", "owner_id", "created_at", "updated_at"],
+    {
+        "owner": Expansion(Project.owner, UserSimple, foreign_key="owner_id"),
+        "members": Expansion(Project.members, List[ProjectMemberResponse], nested=ProjectMember.user),
+    },
+)
+
+MEMBER_FIELDS = FieldSet(
+    ProjectMember,
+    ["id", "project_id", "user_id", "role", "joined_at"],
+    {"user": Expansion(ProjectMember.user, UserSimple, foreign_key="user_id")},
+)
@@ -1,11 +1,18 @@
-from fastapi import FastAPI
+from fastapi import FastAPI, Depends
 from fastapi.concurrency import asynccontextmanager
 from fastapi.middleware.cors import CORSMiddleware
 from sqlalchemy import text
 from database import engine, Base
+from activity import activity_log, ensure_partitions
+from reminders import reminder_scheduler
+from archiver import task_archiver
+from purger import purger
+from auth import get_current_user_with_db
+from models import User
 import userRoutes
 import projectRoutes
 import taskRoutes
+import templateRoutes
 
 
 @asynccontextmanager
@@ -13,20 +20,65 @@ async def lifespan(app: FastAPI):
     async with engine.begin() as conn:
         # Create all tables for the shared Base metadata (no-op if already exists).
         await conn.run_sync(Base.metadata.create_all)
-        # Ensure `email` column exists on `users` table (safe for dev migrations).
-        try:
-            await conn.execute(text("""
-                ALTER TABLE users
-                ADD COLUMN IF NOT EXISTS email VARCHAR
-            """))
-            # Create unique index if not exists (model expects unique index)
-            await conn.execute(text("""
-                CREATE UNIQUE INDEX IF NOT EXISTS ix_users_email ON users (email)
-            """))
-        except Exception:
-            # If anything goes wrong here, don't prevent the app from starting.
-            pass
+        # Column/index back-fills for databases created by older versions. The
+        # syntax is Postgres-only; SQLite support postdates these columns, so
+        # SQLite databases are always created whole by create_all().
+        if conn.dialect.name == "postgresql":
+            # Ensure `email` column exists on `users` table (safe for dev migrations).
+            try:
+                await conn.execute(text("""
+                    ALTER TABLE users
+                    ADD COLUMN IF NOT EXISTS email VARCHAR
+                """))
+                # Create unique index if not exists (model expects unique index)
+                await conn.execute(text("""
+                    CREATE UNIQUE INDEX IF NOT EXISTS ix_users_email ON users (email)
+                """))
+                # Ensure `due_at` column and its partial indexes exist on `tasks`.
+                await conn.execute(text("""
+                    ALTER TABLE tasks
+                    ADD COLUMN IF NOT EXISTS due_at TIMESTAMP
+                """))
+                await conn.execute(text("""
+                    CREATE INDEX IF NOT EXISTS ix_tasks_open_due_at ON tasks (due_at)
+                    WHERE status != 'DONE' AND due_at IS NOT NULL
+                """))
+                await conn.execute(text("""
+                    CREATE INDEX IF NOT EXISTS ix_tasks_open_assignee_due_at ON tasks (assignee_id, due_at)
+                    WHERE status != 'DONE' AND due_at IS NOT NULL
+                """))
+                await conn.execute(text("""
+                    CREATE INDEX IF NOT EXISTS ix_tasks_done_updated_at ON tasks (updated_at)
+                    WHERE status = 'DONE'
+                """))
+                await conn.execute(text("""
+                    CREATE INDEX IF NOT EXISTS ix_tasks_assignee_status_updated_at
+                    ON tasks (assignee_id, status, updated_at, id)
+                """))
+                # Soft-delete markers used by the background purger.
+                await conn.execute(text("""
+                    ALTER TABLE users
+                    ADD COLUMN IF NOT EXISTS deleted_at TIMESTAMP
+                """))
+                await conn.execute(text("""
+                    ALTER TABLE projects
+                    ADD COLUMN IF NOT EXISTS deleted_at TIMESTAMP
+                """))
+            except Exception:
+                # If anything goes wrong here, don't prevent the app from starting.
+                pass
+    async with engine.begin() as conn:
+        await ensure_partitions(conn)
+    activity_log.start()
+    reminder_scheduler.start()
+    task_archiver.start()
+    await purger.start()
     yield
+    await purger.stop()
+    await task_archiver.stop()
+    await reminder_scheduler.stop()
+    # Flush queued activity entries (including reminders) before the engine goes away.
+    await activity_log.stop()
     # Cleanup (optional)
     # async with engine.begin() as conn:
     #     await conn.run_sync(Base.metadata.drop_all)
@@ -54,7 +106,17 @@ app.add_middleware(
 async def read_root():
     return {"message": "Task Management & Collaboration"}
 
+@app.get("/activity/stats")
+async def read_activity_stats():
+    return activity_log.stats()
+
+@app.get("/purges")
+async def read_purge_progress(current_user: User = Depends(get_current_user_with_db)):
+    # Only the caller's own jobs; the list would otherwise expose every deleted id.
+    return purger.progress(current_user.id)
+
 # Include routers
 app.include_router(userRoutes.router, prefix="/users", tags=["Users"])
 app.include_router(projectRoutes.router, prefix="/projects", tags=["Projects"])
-app.include_router(taskRoutes.router, prefix="/tasks", tags=["Tasks"])
\ No newline at end of file
+app.include_router(taskRoutes.router, prefix="/tasks", tags=["Tasks"])
+app.include_router(templateRoutes.router, prefix="/templates", tags=["Templates"])
\ No newline at end of file
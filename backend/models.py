@@ -1,5 +1,5 @@
 from xmlrpc.client import Boolean
-from sqlalchemy import Column, Integer, String, Enum, ForeignKey, DateTime, Text
+from sqlalchemy import Column, Identity, Integer, BigInteger, String, Enum, ForeignKey, DateTime, Text, JSON, Index
 from sqlalchemy.orm import relationship
 from database import Base
 from datetime import datetime
@@ -17,19 +17,25 @@ class TaskStatus(str, enum.Enum):
 
 class User(Base):
     __tablename__ = "users"
+    # Never hand out a freed id again (Postgres sequences already guarantee this):
+    # tokens and the activity log refer to rows by id.
+    __table_args__ = {"sqlite_autoincrement": True}
     
     id = Column(Integer, primary_key=True, index=True)
     username = Column(String, unique=True, index=True, nullable=False)
     email = Column(String, unique=True, index=True, nullable=False)
     name = Column(String, nullable=True)
     password = Column(String, nullable=False)
+    # Set by delete_user; the row and its children are removed later by purger.py.
+    deleted_at = Column(DateTime, nullable=True)
 
 ### relationships 
-    project_membership = relationship("ProjectMember", back_populates="user", cascade="all, delete-orphan")
+    project_membership = relationship("ProjectMember", back_populates="user", cascade="all, delete-orphan", passive_deletes=True)
     assigned_tasks = relationship("Task", back_populates="assignee")
 
 class Project(Base):
     __tablename__ = "projects"
+    __table_args__ = {"sqlite_autoincrement": True}
     
     id = Column(Integer, primary_key=True, index=True)
     name = Column(String, nullable=False)
@@ -37,14 +43,18 @@ class Project(Base):
     owner_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False, index=True)
     created_at = Column(DateTime, default=datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    # Set by delete_project; the row and its children are removed later by purger.py.
+    deleted_at = Column(DateTime, nullable=True)
     
 ### relationships
+    # passive_deletes: leave child rows to ON DELETE CASCADE instead of loading them to delete one by one.
     owner = relationship("User", foreign_keys=[owner_id])
-    members = relationship("ProjectMember", back_populates="project", cascade="all, delete-orphan")
-    tasks = relationship("Task", back_populates="project", cascade="all, delete-orphan")
+    members = relationship("ProjectMember", back_populates="project", cascade="all, delete-orphan", passive_deletes=True)
+    tasks = relationship("Task", back_populates="project", cascade="all, delete-orphan", passive_deletes=True)
 
 class ProjectMember(Base):
     __tablename__ = "project_members"
+    __table_args__ = {"sqlite_autoincrement": True}
     
     id = Column(Integer, primary_key=True, index=True)
     project_id = Column(Integer, ForeignKey("projects.id", ondelete="CASCADE"), nullable=False, index=True)
@@ -58,11 +68,13 @@ class ProjectMember(Base):
 
 class Task(Base):
     __tablename__ = "tasks"
+    __table_args__ = {"sqlite_autoincrement": True}
     
     id = Column(Integer, primary_key=True, index=True)
     title = Column(String, nullable=False)
     description = Column(Text, nullable=True)
     status = Column(Enum(TaskStatus), default=TaskStatus.TODO, nullable=False)
+    due_at = Column(DateTime, nullable=True)
 
     ### Foreign keys
     project_id = Column(Integer, ForeignKey("projects.id", ondelete="CASCADE"), nullable=False, index=True)
@@ -74,4 +86,84 @@ class Task(Base):
     
     ### relationships
     project = relationship("Project", back_populates="tasks")
-    assignee = relationship("User", back_populates="assigned_tasks")
\ No newline at end of file
+    assignee = relationship("User", back_populates="assigned_tasks")
+
+# Partial indexes over open tasks with a due date: the reminder scheduler range-scans
+# the first, "my overdue tasks" the second. Done tasks never enter either index.
+_open_due = (Task.status != TaskStatus.DONE) & Task.due_at.isnot(None)
+Index("ix_tasks_open_due_at", Task.due_at, postgresql_where=_open_due, sqlite_where=_open_due)
+Index("ix_tasks_open_assignee_due_at", Task.assignee_id, Task.due_at, postgresql_where=_open_due, sqlite_where=_open_due)
+# Serves GET /tasks/mine: one range scan per assignee (and status), already in updated_at order.
+Index("ix_tasks_assignee_status_updated_at", Task.assignee_id, Task.status, Task.updated_at, Task.id)
+
+# Lets the archiver find old Done tasks without scanning open ones.
+_done = Task.status == TaskStatus.DONE
+Index("ix_tasks_done_updated_at", Task.updated_at, postgresql_where=_done, sqlite_where=_done)
+
+class ArchivedTask(Base):
+    __tablename__ = "archived_tasks"
+
+    # Same columns as Task; rows keep their original id so they can be restored.
+    id = Column(Integer, primary_key=True, autoincrement=False)
+    title = Column(String, nullable=False)
+    description = Column(Text, nullable=True)
+    status = Column(Enum(TaskStatus), default=TaskStatus.DONE, nullable=False)
+    due_at = Column(DateTime, nullable=True)
+
+    ### Foreign keys
+    project_id = Column(Integer, ForeignKey("projects.id", ondelete="CASCADE"), nullable=False, index=True)
+    assignee_id = Column(Integer, ForeignKey("users.id", ondelete="SET NULL"), nullable=True)
+
+    ### Timestamps
+    created_at = Column(DateTime)
+    updated_at = Column(DateTime)
+    archived_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+
+class ActivityLog(Base):
+    __tablename__ = "activity_log"
+    # Range-partitioned by month on Postgres; partitions are created by
+    # activity.ensure_partitions(). created_at is part of the primary key
+    # because Postgres requires the partition key in every unique constraint.
+    __table_args__ = (
+        Index("ix_activity_log_project_created", "project_id", "created_at", "id"),
+        {"postgresql_partition_by": "RANGE (created_at)"},
+    )
+
+    id = Column(BigInteger, Identity(), primary_key=True)
+    created_at = Column(DateTime, primary_key=True, default=datetime.utcnow)
+
+    ### No foreign keys: the audit trail outlives the rows it describes
+    project_id = Column(Integer, nullable=True)
+    actor_id = Column(Integer, nullable=True)
+    entity_type = Column(String, nullable=False)
+    entity_id = Column(Integer, nullable=True)
+    action = Column(String, nullable=False)
+    details = Column(JSON, nullable=True)
+
+class ProjectTemplate(Base):
+    __tablename__ = "project_templates"
+    __table_args__ = {"sqlite_autoincrement": True}
+
+    id = Column(Integer, primary_key=True, index=True)
+    name = Column(String, nullable=False)
+    description = Column(Text, nullable=True)
+    owner_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False, index=True)
+    created_at = Column(DateTime, default=datetime.utcnow)
+
+class TemplateTask(Base):
+    __tablename__ = "template_tasks"
+
+    id = Column(Integer, primary_key=True)
+    template_id = Column(Integer, ForeignKey("project_templates.id", ondelete="CASCADE"), nullable=False, index=True)
+    title = Column(String, nullable=False)
+    description = Column(Text, nullable=True)
+    status = Column(Enum(TaskStatus), default=TaskStatus.TODO, nullable=False)
+    assignee_id = Column(Integer, ForeignKey("users.id", ondelete="SET NULL"), nullable=True)
+
+class TemplateMember(Base):
+    __tablename__ = "template_members"
+
+    id = Column(Integer, primary_key=True)
+    template_id = Column(Integer, ForeignKey("project_templates.id", ondelete="CASCADE"), nullable=False, index=True)
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
+    role = Column(Enum(ProjectRole), default=ProjectRole.MEMBER, nullable=False)
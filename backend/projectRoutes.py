@@ -1,32 +1,45 @@
-from sqlalchemy import select, func
+import asyncio
+import os
+from sqlalchemy import select, func, tuple_, exists
 from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload 
-from database import get_db
-from models import Project, ProjectMember, User
+from database import get_db, AsyncSessionLocal, READ_POOL_CAPACITY
+from models import Project, ProjectMember, User, Task, ActivityLog
 from typing import List, Optional
+from datetime import datetime
 from auth import get_current_user_with_db
-from schemas import ProjectCreate, ProjectResponse, ProjectUpdate, ProjectListResponse, ProjectMemberAdd, ProjectMemberResponse, ProjectMemberUpdate
+from activity import activity_log
+from cache import response_cache
+from purger import purger
+from cloning import copy_project_tasks, copy_project_members
+from fieldsets import PROJECT_FIELDS, MEMBER_FIELDS
+from schemas import ProjectCreate, ProjectResponse, ProjectUpdate, ProjectListResponse, ProjectMemberAdd, ProjectMemberResponse, ProjectMemberUpdate, ActivityResponse, ProjectBootstrapResponse, ProjectCloneOptions, ProjectCloneResponse
 
 router = APIRouter()
 
+# Each bootstrap holds four pooled connections while it fans out; cap how many run at once
+# (by default as many as the read pool can serve) so page loads queue here instead of exhausting the pool.
+BOOTSTRAP_CONCURRENCY = int(os.getenv("BOOTSTRAP_CONCURRENCY", str(max(READ_POOL_CAPACITY // 4, 1))))
+_bootstrap_slots = asyncio.Semaphore(BOOTSTRAP_CONCURRENCY)
+
 @router.post("/", response_model=ProjectResponse, status_code=status.HTTP_201_CREATED)
 async def create_project(project_data: ProjectCreate, db: AsyncSession = Depends(get_db), current_user: User = Depends(get_current_user_with_db)):
     new_project = Project(owner_id=current_user.id, name=project_data.name, description=project_data.description)
     db.add(new_project)
     await db.commit()
+    activity_log.record("project.created", "project", new_project.id, project_id=new_project.id, actor_id=current_user.id)
     result = await db.execute(
         select(Project).options(selectinload(Project.owner), selectinload(Project.members)).where(Project.id == new_project.id)
     )
     project = result.scalar_one()
-    await db.refresh(new_project)
     return project
 
 @router.get("/", response_model=List[ProjectListResponse])
 async def list_projects(db: AsyncSession = Depends(get_db), current_user: User = Depends(get_current_user_with_db)):
     # Get projects where user is owner
     owned_projects_result = await db.execute(
-        select(Project).where(Project.owner_id == current_user.id)
+        select(Project).where(Project.owner_id == current_user.id, Project.deleted_at.is_(None))
     )
     owned_projects = owned_projects_result.scalars().all()
     
@@ -34,7 +47,7 @@ async def list_projects(db: AsyncSession = Depends(get_db), current_user: User =
     member_projects_result = await db.execute(
         select(Project)
         .join(ProjectMember)
-        .where(ProjectMember.user_id == current_user.id)
+        .where(ProjectMember.user_id == current_user.id, Project.deleted_at.is_(None))
     )
     member_projects = member_projects_result.scalars().all()
     
@@ -60,16 +73,119 @@ async def list_projects(db: AsyncSession = Depends(get_db), current_user: User =
     return response
 
 @router.get("/{project_id}", response_model=ProjectResponse)
-async def get_project(project_id: int, db: AsyncSession = Depends(get_db), current_user: User = Depends(get_current_user_with_db)):
-    result = await db.execute(
-        select(Project).options(selectinload(Project.owner), selectinload(Project.members)).where(Project.id == project_id)
+async def get_project(project_id: int, fields: Optional[str] = None, expand: Optional[str] = None, db: AsyncSession = Depends(get_db), current_user: User = Depends(get_current_user_with_db)):
+    selection = PROJECT_FIELDS.parse(fields, expand)
+    owner_result = await db.execute(select(Project.owner_id).where(Project.id == project_id, Project.deleted_at.is_(None)))
+    owner_id = owner_result.scalar_one_or_none()
+    if owner_id is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Project not found")
+    
+    # Check if user is owner or member
+    is_owner = owner_id == current_user.id
+    is_member = await db.execute(
+        select(ProjectMember).where(
+            ProjectMember.project_id == project_id,
+            ProjectMember.user_id == current_user.id
+        )
     )
+    member_exists = is_member.scalar_one_or_none()
+    
+    if not is_owner and not member_exists:
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Not authorized to view this project")
+    
+    # Authorization above runs on every request; the cached body is the same for every viewer.
+    cache_key = f"project:{project_id}" + (selection.cache_suffix() if selection else "")
+    cached = await response_cache.get(cache_key)
+    if cached is not None:
+        return cached
+    generation = await response_cache.generation()
+    
+    if selection is None:
+        options = [selectinload(Project.owner), selectinload(Project.members)]
+    else:
+        options = PROJECT_FIELDS.options(selection)
+    result = await db.execute(select(Project).options(*options).where(Project.id == project_id))
     project = result.scalar_one_or_none()
     if project is None:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Project not found")
+    # Tag with the owner even when it is not expanded, so deleting the owner drops the entry.
+    tags = [f"project:{project_id}", f"user:{owner_id}"]
+    if selection is None:
+        return await response_cache.put(cache_key, ProjectResponse, project, tags + [f"user:{m.user_id}" for m in project.members], generation)
+    if "members" in selection.expand:
+        tags += [f"user:{m.user_id}" for m in project.members]
+    return await response_cache.put(cache_key, dict, PROJECT_FIELDS.dump(selection, project), tags, generation)
+
+@router.get("/{project_id}/bootstrap", response_model=ProjectBootstrapResponse)
+async def get_project_bootstrap(project_id: int, task_limit: int = 50, db: AsyncSession = Depends(get_db), current_user: User = Depends(get_current_user_with_db)):
+    # Everything ProjectDetailPage needs for its first render, authorized once.
+    access_result = await db.execute(
+        select(
+            Project.owner_id,
+            exists().where(ProjectMember.project_id == project_id, ProjectMember.user_id == current_user.id)
+        ).where(Project.id == project_id, Project.deleted_at.is_(None))
+    )
+    access = access_result.one_or_none()
+    if access is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Project not found")
+    owner_id, is_member = access
+    if owner_id != current_user.id and not is_member:
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Not authorized to view this project")
+    
+    task_limit = min(max(task_limit, 1), 200)
+    # Hand the request's connection back before taking four more from the same pool.
+    await db.close()
+    
+    # The sub-queries are independent, so each gets its own session (and connection) and they run concurrently.
+    async def load_project():
+        async with AsyncSessionLocal() as session:
+            result = await session.execute(select(Project).options(selectinload(Project.owner)).where(Project.id == project_id))
+            return result.scalar_one_or_none()
+    
+    async def load_members():
+        async with AsyncSessionLocal() as session:
+            result = await session.execute(
+                select(ProjectMember).options(selectinload(ProjectMember.user)).where(ProjectMember.project_id == project_id)
+            )
+            return result.scalars().all()
+    
+    async def load_tasks():
+        async with AsyncSessionLocal() as session:
+            # Fetch one extra row to know whether there is a next page.
+            result = await session.execute(
+                select(Task).where(Task.project_id == project_id).order_by(Task.id).limit(task_limit + 1)
+            )
+            return result.scalars().all()
+    
+    async def load_task_counts():
+        async with AsyncSessionLocal() as session:
+            result = await session.execute(
+                select(Task.status, func.count(Task.id)).where(Task.project_id == project_id).group_by(Task.status)
+            )
+            return dict(result.all())
+    
+    async with _bootstrap_slots:
+        project, members, tasks, task_counts = await asyncio.gather(load_project(), load_members(), load_tasks(), load_task_counts())
+    if project is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Project not found")
+    
+    return ProjectBootstrapResponse(
+        project=project,
+        members=members,
+        tasks=tasks[:task_limit],
+        task_counts=task_counts,
+        has_more_tasks=len(tasks) > task_limit
+    )
+
+@router.post("/{project_id}/clone", response_model=ProjectCloneResponse, status_code=status.HTTP_201_CREATED)
+async def clone_project(project_id: int, options: ProjectCloneOptions, db: AsyncSession = Depends(get_db), current_user: User = Depends(get_current_user_with_db)):
+    project_result = await db.execute(select(Project).where(Project.id == project_id, Project.deleted_at.is_(None)))
+    source = project_result.scalar_one_or_none()
+    if source is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Project not found")
     
     # Check if user is owner or member
-    is_owner = project.owner_id == current_user.id
+    is_owner = source.owner_id == current_user.id
     is_member = await db.execute(
         select(ProjectMember).where(
             ProjectMember.project_id == project_id,
@@ -79,13 +195,32 @@ async def get_project(project_id: int, db: AsyncSession = Depends(get_db), curre
     member_exists = is_member.scalar_one_or_none()
     
     if not is_owner and not member_exists:
-        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Not authorized to view this project")
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Not authorized to clone this project")
     
-    return project
+    # The caller owns the clone. Tasks and memberships are copied with one INSERT ... SELECT each.
+    new_project = Project(
+        owner_id=current_user.id,
+        name=options.name or f"{source.name} (copy)",
+        description=options.description if options.description is not None else source.description
+    )
+    db.add(new_project)
+    await db.flush()
+    task_count = 0
+    member_count = 0
+    # Members first: copied tasks keep only assignees who can access the new project.
+    if options.include_members:
+        member_count = await copy_project_members(db, project_id, new_project.id, current_user.id, source.owner_id)
+    if options.include_tasks:
+        task_count = await copy_project_tasks(db, project_id, new_project.id, current_user.id, options.include_members, options.reset_status)
+    await db.commit()
+    activity_log.record("project.cloned", "project", new_project.id, project_id=new_project.id, actor_id=current_user.id, details={"source_project_id": project_id, "tasks": task_count, "members": member_count})
+    
+    result = await db.execute(select(Project).options(selectinload(Project.owner)).where(Project.id == new_project.id))
+    return ProjectCloneResponse(project=result.scalar_one(), task_count=task_count, member_count=member_count)
 
 @router.put("/{project_id}", response_model=ProjectResponse)
 async def update_project(project_id: int, project_data: ProjectUpdate, db: AsyncSession = Depends(get_db), current_user: User = Depends(get_current_user_with_db)):
-    result = await db.execute(select(Project).where(Project.id == project_id))
+    result = await db.execute(select(Project).where(Project.id == project_id, Project.deleted_at.is_(None)))
     project = result.scalar_one_or_none()
     if project is None:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Project not found")
@@ -97,27 +232,34 @@ async def update_project(project_id: int, project_data: ProjectUpdate, db: Async
         setattr(project, key, value)
     
     await db.commit()
+    await response_cache.invalidate(f"project:{project_id}")
+    activity_log.record("project.updated", "project", project.id, project_id=project.id, actor_id=current_user.id, details={"changes": update_data})
     await db.refresh(project)
     return project
 
 @router.delete("/{project_id}", status_code=status.HTTP_204_NO_CONTENT)
 async def delete_project(project_id: int, db: AsyncSession = Depends(get_db), current_user: User = Depends(get_current_user_with_db)):
-    result = await db.execute(select(Project).where(Project.id == project_id))
+    result = await db.execute(select(Project).where(Project.id == project_id, Project.deleted_at.is_(None)))
     project = result.scalar_one_or_none()
     if project is None:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Project not found")
     if project.owner_id != current_user.id:
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Not authorized to delete this project")
     
-    await db.delete(project)
+    # Mark the project deleted and return; purger.py removes its tasks and members in batches.
+    project.deleted_at = datetime.utcnow()
     await db.commit()
+    purger.enqueue("project", project_id, current_user.id)
+    await response_cache.invalidate(f"project:{project_id}", f"project:{project_id}:tasks")
+    activity_log.record("project.deleted", "project", project_id, project_id=project_id, actor_id=current_user.id)
 
 ### Project Member Management
 
 @router.get("/{project_id}/members", response_model=List[ProjectMemberResponse])
-async def get_project_members(project_id: int, db: AsyncSession = Depends(get_db), current_user: User = Depends(get_current_user_with_db)):
+async def get_project_members(project_id: int, fields: Optional[str] = None, expand: Optional[str] = None, db: AsyncSession = Depends(get_db), current_user: User = Depends(get_current_user_with_db)):
+    selection = MEMBER_FIELDS.parse(fields, expand)
     # Check if project exists
-    project_result = await db.execute(select(Project).where(Project.id == project_id))
+    project_result = await db.execute(select(Project).where(Project.id == project_id, Project.deleted_at.is_(None)))
     project = project_result.scalar_one_or_none()
     if project is None:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Project not found")
@@ -135,19 +277,38 @@ async def get_project_members(project_id: int, db: AsyncSession = Depends(get_db
     if not is_owner and not member_exists:
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Only project members can view member list")
     
-    # Get all members with user details
+    cache_key = f"project:{project_id}:members" + (selection.cache_suffix() if selection else "")
+    cached = await response_cache.get(cache_key)
+    if cached is not None:
+        return cached
+    generation = await response_cache.generation()
+    
+    if selection is None:
+        # Get all members with user details
+        result = await db.execute(
+            select(ProjectMember)
+            .options(selectinload(ProjectMember.user))
+            .where(ProjectMember.project_id == project_id)
+        )
+        members = result.scalars().all()
+        tags = [f"project:{project_id}"] + [f"user:{m.user_id}" for m in members]
+        return await response_cache.put(cache_key, List[ProjectMemberResponse], members, tags, generation)
+    
     result = await db.execute(
         select(ProjectMember)
-        .options(selectinload(ProjectMember.user))
+        .options(*MEMBER_FIELDS.options(selection))
         .where(ProjectMember.project_id == project_id)
     )
     members = result.scalars().all()
-    return members
+    tags = [f"project:{project_id}"]
+    if "user" in selection.expand:
+        tags += [f"user:{m.user_id}" for m in members]
+    return await response_cache.put(cache_key, List[dict], [MEMBER_FIELDS.dump(selection, m) for m in members], tags, generation)
 
 @router.post("/{project_id}/members", response_model=ProjectMemberResponse, status_code=status.HTTP_201_CREATED)
 async def add_project_member(project_id: int, member_data: ProjectMemberAdd, db: AsyncSession = Depends(get_db), current_user: User = Depends(get_current_user_with_db)):
     # Check if project exists
-    project_result = await db.execute(select(Project).where(Project.id == project_id))
+    project_result = await db.execute(select(Project).where(Project.id == project_id, Project.deleted_at.is_(None)))
     project = project_result.scalar_one_or_none()
     if project is None:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Project not found")
@@ -157,7 +318,7 @@ async def add_project_member(project_id: int, member_data: ProjectMemberAdd, db:
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Only project owner can add members")
     
     # Check if user exists
-    user_result = await db.execute(select(User).where(User.id == member_data.user_id))
+    user_result = await db.execute(select(User).where(User.id == member_data.user_id, User.deleted_at.is_(None)))
     user = user_result.scalar_one_or_none()
     if user is None:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="User not found")
@@ -180,6 +341,8 @@ async def add_project_member(project_id: int, member_data: ProjectMemberAdd, db:
     )
     db.add(new_member)
     await db.commit()
+    await response_cache.invalidate(f"project:{project_id}")
+    activity_log.record("member.added", "member", new_member.id, project_id=project_id, actor_id=current_user.id, details={"user_id": member_data.user_id, "role": member_data.role})
     
     # Refresh and return with user details
     result = await db.execute(
@@ -192,7 +355,7 @@ async def add_project_member(project_id: int, member_data: ProjectMemberAdd, db:
 @router.put("/{project_id}/members/{member_id}", response_model=ProjectMemberResponse)
 async def update_project_member(project_id: int, member_id: int, member_data: ProjectMemberUpdate, db: AsyncSession = Depends(get_db), current_user: User = Depends(get_current_user_with_db)):
     # Check if project exists
-    project_result = await db.execute(select(Project).where(Project.id == project_id))
+    project_result = await db.execute(select(Project).where(Project.id == project_id, Project.deleted_at.is_(None)))
     project = project_result.scalar_one_or_none()
     if project is None:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Project not found")
@@ -215,6 +378,8 @@ async def update_project_member(project_id: int, member_id: int, member_data: Pr
     # Update role
     member.role = member_data.role
     await db.commit()
+    await response_cache.invalidate(f"project:{project_id}")
+    activity_log.record("member.updated", "member", member_id, project_id=project_id, actor_id=current_user.id, details={"user_id": member.user_id, "role": member_data.role})
     
     # Refresh and return with user details
     result = await db.execute(
@@ -227,7 +392,7 @@ async def update_project_member(project_id: int, member_id: int, member_data: Pr
 @router.delete("/{project_id}/members/{member_id}", status_code=status.HTTP_204_NO_CONTENT)
 async def remove_project_member(project_id: int, member_id: int, db: AsyncSession = Depends(get_db), current_user: User = Depends(get_current_user_with_db)):
     # Check if project exists
-    project_result = await db.execute(select(Project).where(Project.id == project_id))
+    project_result = await db.execute(select(Project).where(Project.id == project_id, Project.deleted_at.is_(None)))
     project = project_result.scalar_one_or_none()
     if project is None:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Project not found")
@@ -250,5 +415,39 @@ async def remove_project_member(project_id: int, member_id: int, db: AsyncSessio
     # Remove member
     await db.delete(member)
     await db.commit()
+    await response_cache.invalidate(f"project:{project_id}")
+    activity_log.record("member.removed", "member", member_id, project_id=project_id, actor_id=current_user.id, details={"user_id": member.user_id})
 
+### Project Activity
 
+@router.get("/{project_id}/activity", response_model=List[ActivityResponse])
+async def get_project_activity(project_id: int, limit: int = 50, before: Optional[datetime] = None, before_id: Optional[int] = None, db: AsyncSession = Depends(get_db), current_user: User = Depends(get_current_user_with_db)):
+    project_result = await db.execute(select(Project).where(Project.id == project_id, Project.deleted_at.is_(None)))
+    project = project_result.scalar_one_or_none()
+    if project is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Project not found")
+    
+    # Check if user is owner or member
+    is_owner = project.owner_id == current_user.id
+    is_member = await db.execute(
+        select(ProjectMember).where(
+            ProjectMember.project_id == project_id,
+            ProjectMember.user_id == current_user.id
+        )
+    )
+    member_exists = is_member.scalar_one_or_none()
+    
+    if not is_owner and not member_exists:
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Only project members can view project activity")
+    
+    # Keyset pagination, newest first: pass the last entry's created_at/id as before/before_id.
+    # Bounding created_at also lets Postgres prune older monthly partitions.
+    query = select(ActivityLog).where(ActivityLog.project_id == project_id)
+    if before is not None:
+        if before_id is not None:
+            query = query.where(tuple_(ActivityLog.created_at, ActivityLog.id) < tuple_(before, before_id))
+        else:
+            query = query.where(ActivityLog.created_at < before)
+    query = query.order_by(ActivityLog.created_at.desc(), ActivityLog.id.desc()).limit(min(max(limit, 1), 200))
+    result = await db.execute(query)
+    return result.scalars().all()
@@ -0,0 +1,144 @@
+"""
+Chunked background purge for deleted projects and users.
+
+The delete routes only stamp `deleted_at` and return; every read filters marked
+rows out. This worker then removes the children in bounded batches (one short
+transaction each) and finally the row itself, so a 100k-task project never has
+to be loaded into memory or deleted inside a request. Rows still marked at
+startup are re-queued, so an interrupted purge resumes.
+"""
+import asyncio
+import logging
+import os
+from collections import OrderedDict
+from datetime import datetime
+from typing import Optional
+from sqlalchemy import select, delete, update
+from database import AsyncSessionLocal
+from models import Project, ProjectMember, Task, ArchivedTask, User
+from activity import activity_log
+from cache import response_cache
+
+logger = logging.getLogger(__name__)
+
+PURGE_BATCH_SIZE = int(os.getenv("PURGE_BATCH_SIZE", "1000"))
+# How many finished jobs to keep for GET /purges.
+PURGE_HISTORY = 100
+
+
+class Purger:
+    def __init__(self, session_factory, batch_size: int = PURGE_BATCH_SIZE):
+        self.session_factory = session_factory
+        self.batch_size = batch_size
+        self.queue: Optional[asyncio.Queue] = None
+        self._task: Optional[asyncio.Task] = None
+        # (entity, id) -> progress
+        self.jobs: "OrderedDict[tuple, dict]" = OrderedDict()
+
+    async def start(self):
+        if self._task is not None:
+            return
+        self.queue = asyncio.Queue()
+        self._task = asyncio.create_task(self._run(), name="purger")
+        # Resume purges interrupted by a restart.
+        async with self.session_factory() as db:
+            users = await db.execute(select(User.id).where(User.deleted_at.isnot(None)))
+            projects = await db.execute(select(Project.id, Project.owner_id).where(Project.deleted_at.isnot(None)))
+            for user_id in users.scalars().all():
+                self.enqueue("user", user_id, user_id)
+            for project_id, owner_id in projects.all():
+                self.enqueue("project", project_id, owner_id)
+
+    async def stop(self):
+        if self._task is None:
+            return
+        # Whatever is left stays marked and is picked up again on the next start.
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+    def enqueue(self, entity: str, entity_id: int, owner_id: int):
+        key = (entity, entity_id)
+        if key in self.jobs and self.jobs[key]["status"] in ("queued", "running"):
+            return
+        self.jobs[key] = {"entity": entity, "id": entity_id, "owner_id": owner_id, "status": "queued", "deleted": {}, "started_at": None, "finished_at": None}
+        self.jobs.move_to_end(key)
+        while len(self.jobs) > PURGE_HISTORY and next(iter(self.jobs.values()))["status"] not in ("queued", "running"):
+            self.jobs.popitem(last=False)
+        if self.queue is not None:
+            self.queue.put_nowait(key)
+
+    def progress(self, owner_id: int) -> list:
+        return [job for job in self.jobs.values() if job["owner_id"] == owner_id]
+
+    async def _run(self):
+        while True:
+            key = await self.queue.get()
+            job = self.jobs[key]
+            job["status"] = "running"
+            job["started_at"] = datetime.utcnow()
+            try:
+                if key[0] == "project":
+                    await self._purge_project(key[1], job["deleted"])
+                else:
+                    await self._purge_user(key[1], job["deleted"])
+            except Exception:
+                job["status"] = "failed"
+                logger.exception("Purge of %s %s failed", *key)
+            else:
+                job["status"] = "done"
+                activity_log.record(f"{key[0]}.purged", key[0], key[1], project_id=key[1] if key[0] == "project" else None, details=job["deleted"])
+            job["finished_at"] = datetime.utcnow()
+
+    async def _in_batches(self, model, where, counts: dict, name: str, values: Optional[dict] = None):
+        """
+        Delete (or update with `values`) the rows matching `where`, one committed batch at a time,
+        dropping cached responses of every project a batch touched.
+        """
+        while True:
+            async with self.session_factory() as db:
+                rows = (await db.execute(select(model.id, model.project_id).where(*where).limit(self.batch_size))).all()
+                if not rows:
+                    return
+                # Re-check `where` in case a row changed since it was picked.
+                statement = delete(model) if values is None else update(model).values(**values)
+                statement = statement.where(model.id.in_([row.id for row in rows]), *where)
+                result = await db.execute(statement.execution_options(synchronize_session=False))
+                await db.commit()
+            counts[name] = counts.get(name, 0) + result.rowcount
+            await response_cache.invalidate(*{tag for row in rows for tag in (f"project:{row.project_id}", f"project:{row.project_id}:tasks")})
+            if len(rows) < self.batch_size:
+                return
+            # Let request handlers in between batches.
+            await asyncio.sleep(0)
+
+    async def _purge_project(self, project_id: int, counts: dict):
+        await self._in_batches(Task, [Task.project_id == project_id], counts, "tasks")
+        await self._in_batches(ArchivedTask, [ArchivedTask.project_id == project_id], counts, "archived_tasks")
+        await self._in_batches(ProjectMember, [ProjectMember.project_id == project_id], counts, "members")
+        # Anything added while the batches ran goes with the row through ON DELETE CASCADE.
+        async with self.session_factory() as db:
+            await db.execute(delete(Project).where(Project.id == project_id, Project.deleted_at.isnot(None)))
+            await db.commit()
+        await response_cache.invalidate(f"project:{project_id}", f"project:{project_id}:tasks")
+
+    async def _purge_user(self, user_id: int, counts: dict):
+        async with self.session_factory() as db:
+            owned = await db.execute(select(Project.id).where(Project.owner_id == user_id))
+            owned_ids = owned.scalars().all()
+        for project_id in owned_ids:
+            await self._purge_project(project_id, counts)
+        counts["projects"] = len(owned_ids)
+        await self._in_batches(ProjectMember, [ProjectMember.user_id == user_id], counts, "memberships")
+        await self._in_batches(Task, [Task.assignee_id == user_id], counts, "unassigned_tasks", {"assignee_id": None})
+        await self._in_batches(ArchivedTask, [ArchivedTask.assignee_id == user_id], counts, "unassigned_archived_tasks", {"assignee_id": None})
+        async with self.session_factory() as db:
+            await db.execute(delete(User).where(User.id == user_id, User.deleted_at.isnot(None)))
+            await db.commit()
+        await response_cache.invalidate(f"user:{user_id}")
+
+
+purger = Purger(AsyncSessionLocal)
@@ -0,0 +1,161 @@
+"""
+Due-date reminder and overdue scheduler.
+
+Instead of scanning the tasks table on a timer, the scheduler loads the next
+window of due items from the partial `ix_tasks_open_due_at` index into an
+in-memory min-heap and sleeps until the earliest one. Routes call `schedule()`
+when they set a due date or reopen a task so items created mid-window are not
+missed; scheduling is idempotent, and stale heap entries (task closed, deleted
+or rescheduled) are dropped when they fire.
+"""
+import asyncio
+import heapq
+import logging
+import os
+from datetime import datetime, timedelta, timezone
+from typing import Callable, List, Optional
+from sqlalchemy import select
+from database import AsyncSessionLocal
+from models import Task, TaskStatus
+from activity import activity_log
+
+logger = logging.getLogger(__name__)
+
+REMINDER_WINDOW = timedelta(seconds=int(os.getenv("REMINDER_WINDOW_SECONDS", "900")))
+REMINDER_LEAD = timedelta(seconds=int(os.getenv("REMINDER_LEAD_SECONDS", "3600")))
+
+REMINDER = "reminder"
+OVERDUE = "overdue"
+
+
+def to_utc_naive(value: Optional[datetime]) -> Optional[datetime]:
+    """Normalise an incoming datetime to the naive UTC values stored in the database."""
+    if value is not None and value.tzinfo is not None:
+        return value.astimezone(timezone.utc).replace(tzinfo=None)
+    return value
+
+
+class ReminderScheduler:
+    def __init__(self, session_factory, window: timedelta = REMINDER_WINDOW, lead: timedelta = REMINDER_LEAD):
+        self.session_factory = session_factory
+        self.window = window
+        self.lead = lead
+        # Heap of (fire_at, task_id, kind, due_at)
+        self._heap: list = []
+        # (task_id, kind, due_at) entries currently in the heap, so re-scheduling is idempotent.
+        self._queued: set = set()
+        self._window_start: Optional[datetime] = None
+        self._window_end: Optional[datetime] = None
+        self._wakeup: Optional[asyncio.Event] = None
+        self._task: Optional[asyncio.Task] = None
+        self._listeners: List[Callable] = []
+        self.emitted = 0
+
+    def subscribe(self, callback: Callable):
+        """Register `callback(kind, task)` to be called for every emitted event."""
+        self._listeners.append(callback)
+
+    def start(self):
+        if self._task is not None:
+            return
+        self._wakeup = asyncio.Event()
+        self._task = asyncio.create_task(self._run(), name="reminder-scheduler")
+
+    async def stop(self):
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+        self._heap.clear()
+        self._queued.clear()
+        self._window_start = self._window_end = None
+
+    def schedule(self, task_id: int, due_at: Optional[datetime]):
+        """Add a task's events to the heap if they fall inside the loaded window."""
+        if due_at is None or self._window_end is None:
+            return
+        if self._push(task_id, due_at):
+            self._wakeup.set()
+
+    def _push(self, task_id: int, due_at: datetime) -> bool:
+        pushed = False
+        for kind, fire_at in ((REMINDER, due_at - self.lead), (OVERDUE, due_at)):
+            if self._window_start <= fire_at < self._window_end and (task_id, kind, due_at) not in self._queued:
+                self._queued.add((task_id, kind, due_at))
+                heapq.heappush(self._heap, (fire_at, task_id, kind, due_at))
+                pushed = True
+        return pushed
+
+    async def _refill(self, now: datetime):
+        start = self._window_end or now
+        end = max(now, start) + self.window
+        # One range scan covers both overdue events (due in the window) and
+        # reminders (due one lead interval after the window).
+        async with self.session_factory() as session:
+            result = await session.execute(
+                select(Task.id, Task.due_at)
+                .where(
+                    Task.status != TaskStatus.DONE,
+                    Task.due_at.isnot(None),
+                    Task.due_at >= start,
+                    Task.due_at < end + self.lead,
+                )
+                .order_by(Task.due_at)
+            )
+            rows = result.all()
+        self._window_start, self._window_end = start, end
+        for task_id, due_at in rows:
+            self._push(task_id, due_at)
+
+    async def _fire(self, now: datetime):
+        due = []
+        while self._heap and self._heap[0][0] <= now:
+            entry = heapq.heappop(self._heap)
+            self._queued.discard(entry[1:])
+            due.append(entry)
+        if not due:
+            return
+        async with self.session_factory() as session:
+            result = await session.execute(
+                select(Task).where(Task.id.in_({task_id for _, task_id, _, _ in due}), Task.status != TaskStatus.DONE)
+            )
+            tasks = {task.id: task for task in result.scalars().all()}
+        for _, task_id, kind, due_at in due:
+            task = tasks.get(task_id)
+            if task is None or task.due_at != due_at:
+                continue
+            self.emitted += 1
+            activity_log.record(
+                f"task.{kind}", "task", task.id, project_id=task.project_id,
+                details={"assignee_id": task.assignee_id, "due_at": task.due_at.isoformat()},
+            )
+            for callback in self._listeners:
+                try:
+                    callback(kind, task)
+                except Exception:
+                    logger.exception("Reminder listener failed for task %s", task.id)
+
+    async def _run(self):
+        while True:
+            try:
+                now = datetime.utcnow()
+                if self._window_end is None or now >= self._window_end:
+                    await self._refill(now)
+                await self._fire(now)
+                next_at = self._heap[0][0] if self._heap else self._window_end
+                timeout = (min(next_at, self._window_end) - datetime.utcnow()).total_seconds()
+            except Exception:
+                logger.exception("Reminder scheduler iteration failed")
+                timeout = self.window.total_seconds()
+            self._wakeup.clear()
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), max(timeout, 0))
+            except asyncio.TimeoutError:
+                pass
+
+
+reminder_scheduler = ReminderScheduler(AsyncSessionLocal)
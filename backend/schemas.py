@@ -1,5 +1,5 @@
 from pydantic import BaseModel, EmailStr, Field
-from typing import Optional, List
+from typing import Optional, List, Dict
 from datetime import datetime
 from models import ProjectRole, TaskStatus
 
@@ -59,12 +59,17 @@ class UserSimple(BaseModel):
     class Config:
         from_attributes = True
 
-class ProjectResponse(ProjectBase):
+class ProjectInfo(ProjectBase):
     id : int 
     owner_id : int
     owner : UserSimple
     created_at : datetime
     updated_at : datetime
+
+    class Config:
+        from_attributes = True
+
+class ProjectResponse(ProjectInfo):
     members : List[ProjectMemberInfo] = []
 
     class config:
@@ -111,6 +116,7 @@ class TaskBase(BaseModel):
     description : Optional[str] = None
     status : TaskStatus = TaskStatus.TODO
     assignee_id : Optional[int] = None
+    due_at : Optional[datetime] = None
 
 class TaskCreate(TaskBase):
     pass
@@ -120,6 +126,7 @@ class TaskUpdate(BaseModel):
     description : Optional[str] = None
     status : Optional[TaskStatus] = None
     assignee_id : Optional[int] = None
+    due_at : Optional[datetime] = None
 
 class TaskResponse(TaskBase):
     id : int
@@ -129,4 +136,66 @@ class TaskResponse(TaskBase):
 
     class Config:
         orm_mode = True
-        from_attributes = True
\ No newline at end of file
+        from_attributes = True
+
+class ArchivedTaskResponse(TaskResponse):
+    archived_at : datetime
+
+    class Config:
+        from_attributes = True
+
+### bootstrap schemas
+
+class ProjectBootstrapResponse(BaseModel):
+    project : ProjectInfo
+    members : List[ProjectMemberResponse]
+    tasks : List[TaskResponse]
+    task_counts : Dict[TaskStatus, int]
+    has_more_tasks : bool
+
+### activity schemas
+
+class ActivityResponse(BaseModel):
+    id : int
+    created_at : datetime
+    project_id : Optional[int] = None
+    actor_id : Optional[int] = None
+    entity_type : str
+    entity_id : Optional[int] = None
+    action : str
+    details : Optional[dict] = None
+
+    class Config:
+        from_attributes = True
+
+### clone and template schemas
+
+class ProjectCloneOptions(BaseModel):
+    name : Optional[str] = None
+    description : Optional[str] = None
+    include_tasks : bool = True
+    include_members : bool = True
+    reset_status : bool = True
+
+class ProjectCloneResponse(BaseModel):
+    project : ProjectInfo
+    task_count : int
+    member_count : int
+
+class TemplateCreate(BaseModel):
+    project_id : int
+    name : str
+    description : Optional[str] = None
+    include_members : bool = True
+
+class TemplateResponse(BaseModel):
+    id : int
+    name : str
+    description : Optional[str] = None
+    owner_id : int
+    created_at : datetime
+    task_count : Optional[int] = None
+    member_count : Optional[int] = None
+
+    class Config:
+        from_attributes = True
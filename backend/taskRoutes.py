@@ -1,54 +1,190 @@
 from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy import select
+from sqlalchemy import select, or_, exists, tuple_
+from datetime import datetime
 from sqlalchemy.ext.asyncio import AsyncSession
 from database import get_db
-from models import Task, User
-from typing import List
+from models import Task, TaskStatus, User, ArchivedTask, Project, ProjectMember
+from typing import List, Optional
 from auth import get_current_user_with_db
-from schemas import TaskCreate, TaskUpdate, TaskResponse
+from activity import activity_log
+from reminders import reminder_scheduler, to_utc_naive
+from archiver import restore_task
+from cache import response_cache
+from fieldsets import TASK_FIELDS
+from schemas import TaskCreate, TaskUpdate, TaskResponse, ArchivedTaskResponse
 
 router = APIRouter()
 
+# Tasks of a project marked deleted stay in the table until purger.py gets to them.
+project_is_live = exists().where(Project.id == Task.project_id, Project.deleted_at.is_(None))
+archived_project_is_live = exists().where(Project.id == ArchivedTask.project_id, Project.deleted_at.is_(None))
+
+async def check_project_access(db: AsyncSession, project_id: int, user_id: int):
+    """Raise 404 unless the project is live and 403 unless the user owns it or is a member."""
+    access_result = await db.execute(
+        select(
+            Project.owner_id,
+            exists().where(ProjectMember.project_id == project_id, ProjectMember.user_id == user_id)
+        ).where(Project.id == project_id, Project.deleted_at.is_(None))
+    )
+    access = access_result.one_or_none()
+    if access is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Project not found")
+    owner_id, is_member = access
+    if owner_id != user_id and not is_member:
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Not authorized to access this project")
+
 @router.post("/{project_id}/tasks/", response_model=TaskResponse, status_code=status.HTTP_201_CREATED)
 async def create_task(project_id: int, task_data: TaskCreate, db: AsyncSession = Depends(get_db), current_user: User = Depends(get_current_user_with_db)):
     new_task = Task(
         project_id=project_id,
         title=task_data.title,
         description=task_data.description,
-        assignee_id=task_data.assignee_id
+        assignee_id=task_data.assignee_id,
+        due_at=to_utc_naive(task_data.due_at)
     )
     db.add(new_task)
     await db.commit()
+    await response_cache.invalidate(f"project:{project_id}:tasks")
+    reminder_scheduler.schedule(new_task.id, new_task.due_at)
+    activity_log.record("task.created", "task", new_task.id, project_id=project_id, actor_id=current_user.id, details={"title": task_data.title})
     await db.refresh(new_task)
     return new_task
 
 @router.get("/{project_id}/tasks/", response_model=List[TaskResponse])
-async def get_project_tasks(project_id: int, db: AsyncSession = Depends(get_db)):
-    result = await db.execute(select(Task).where(Task.project_id == project_id))
+async def get_project_tasks(project_id: int, fields: Optional[str] = None, expand: Optional[str] = None, db: AsyncSession = Depends(get_db)):
+    selection = TASK_FIELDS.parse(fields, expand)
+    cache_key = f"project:{project_id}:tasks" + (selection.cache_suffix() if selection else "")
+    cached = await response_cache.get(cache_key)
+    if cached is not None:
+        return cached
+    generation = await response_cache.generation()
+
+    if selection is None:
+        result = await db.execute(select(Task).where(Task.project_id == project_id, project_is_live))
+        tasks = result.scalars().all()
+        return await response_cache.put(cache_key, List[TaskResponse], tasks, [f"project:{project_id}:tasks"], generation)
+
+    result = await db.execute(select(Task).options(*TASK_FIELDS.options(selection)).where(Task.project_id == project_id, project_is_live))
+    tasks = result.scalars().all()
+    tags = [f"project:{project_id}:tasks"]
+    if "assignee" in selection.expand:
+        tags += [f"user:{t.assignee_id}" for t in tasks if t.assignee_id is not None]
+    return await response_cache.put(cache_key, List[dict], [TASK_FIELDS.dump(selection, t) for t in tasks], tags, generation)
+
+@router.get("/mine", response_model=List[TaskResponse])
+async def get_my_tasks(status_filter: Optional[TaskStatus] = None, limit: int = 50, before: Optional[datetime] = None, before_id: Optional[int] = None, db: AsyncSession = Depends(get_db), current_user: User = Depends(get_current_user_with_db)):
+    # Keyset pagination, most recently updated first: pass the last task's updated_at/id as before/before_id.
+    query = (
+        select(Task)
+        .join(Project, Project.id == Task.project_id)
+        .where(
+            Task.assignee_id == current_user.id,
+            Project.deleted_at.is_(None),
+            # Only projects the caller can still see.
+            or_(
+                Project.owner_id == current_user.id,
+                exists().where(ProjectMember.project_id == Task.project_id, ProjectMember.user_id == current_user.id)
+            )
+        )
+    )
+    if status_filter is not None:
+        query = query.where(Task.status == status_filter)
+    if before is not None:
+        if before_id is not None:
+            query = query.where(tuple_(Task.updated_at, Task.id) < tuple_(before, before_id))
+        else:
+            query = query.where(Task.updated_at < before)
+    query = query.order_by(Task.updated_at.desc(), Task.id.desc()).limit(min(max(limit, 1), 200))
+    result = await db.execute(query)
+    tasks = result.scalars().all()
+    return tasks
+
+@router.get("/overdue", response_model=List[TaskResponse])
+async def get_my_overdue_tasks(db: AsyncSession = Depends(get_db), current_user: User = Depends(get_current_user_with_db)):
+    # Served from the partial ix_tasks_open_assignee_due_at index.
+    result = await db.execute(
+        select(Task)
+        .join(Project, Project.id == Task.project_id)
+        .where(
+            Task.assignee_id == current_user.id,
+            Task.status != TaskStatus.DONE,
+            Task.due_at.isnot(None),
+            Task.due_at < datetime.utcnow(),
+            Project.deleted_at.is_(None),
+            # Only projects the caller can still see, as in /mine.
+            or_(
+                Project.owner_id == current_user.id,
+                exists().where(ProjectMember.project_id == Task.project_id, ProjectMember.user_id == current_user.id)
+            )
+        )
+        .order_by(Task.due_at)
+    )
     tasks = result.scalars().all()
     return tasks
 
 @router.put("/{project_id}/tasks/{task_id}", response_model=TaskResponse)
 async def update_task(project_id: int, task_id: int, task_data: TaskUpdate, db: AsyncSession = Depends(get_db), current_user: User = Depends(get_current_user_with_db)):
-    result = await db.execute(select(Task).where(Task.id == task_id, Task.project_id == project_id))
+    result = await db.execute(select(Task).where(Task.id == task_id, Task.project_id == project_id, project_is_live))
     task = result.scalar_one_or_none()
     if task is None:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Task not found")
     
     update_data = task_data.model_dump(exclude_unset=True)
+    if "due_at" in update_data:
+        update_data["due_at"] = to_utc_naive(update_data["due_at"])
+    previous_due_at, was_done = task.due_at, task.status == TaskStatus.DONE
     for key, value in update_data.items():
         setattr(task, key, value)
     
     await db.commit()
+    await response_cache.invalidate(f"project:{project_id}:tasks")
+    activity_log.record("task.updated", "task", task_id, project_id=project_id, actor_id=current_user.id, details={"changes": task_data.model_dump(mode="json", exclude_unset=True)})
+    # Only a new due date or a reopened task needs (re)scheduling.
+    if task.status != TaskStatus.DONE and (task.due_at != previous_due_at or was_done):
+        reminder_scheduler.schedule(task.id, task.due_at)
     await db.refresh(task)
     return task
 
 @router.delete("/{project_id}/tasks/{task_id}", status_code=status.HTTP_204_NO_CONTENT)
 async def delete_task(project_id: int, task_id: int, db: AsyncSession = Depends(get_db), current_user: User = Depends(get_current_user_with_db)):
-    result = await db.execute(select(Task).where(Task.id == task_id, Task.project_id == project_id))
+    result = await db.execute(select(Task).where(Task.id == task_id, Task.project_id == project_id, project_is_live))
     task = result.scalar_one_or_none()
     if task is None:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Task not found")
     
     await db.delete(task)
     await db.commit()
+    await response_cache.invalidate(f"project:{project_id}:tasks")
+    activity_log.record("task.deleted", "task", task_id, project_id=project_id, actor_id=current_user.id)
+
+### Archived tasks (Done tasks moved out of the hot table by archiver.py)
+
+@router.get("/{project_id}/archived/", response_model=List[ArchivedTaskResponse])
+async def get_archived_tasks(project_id: int, limit: int = 100, before_id: Optional[int] = None, db: AsyncSession = Depends(get_db), current_user: User = Depends(get_current_user_with_db)):
+    await check_project_access(db, project_id, current_user.id)
+    query = select(ArchivedTask).where(ArchivedTask.project_id == project_id, archived_project_is_live)
+    if before_id is not None:
+        query = query.where(ArchivedTask.id < before_id)
+    result = await db.execute(query.order_by(ArchivedTask.id.desc()).limit(min(max(limit, 1), 500)))
+    tasks = result.scalars().all()
+    return tasks
+
+@router.post("/{project_id}/archived/{task_id}/restore", response_model=TaskResponse)
+async def restore_archived_task(project_id: int, task_id: int, db: AsyncSession = Depends(get_db), current_user: User = Depends(get_current_user_with_db)):
+    await check_project_access(db, project_id, current_user.id)
+    result = await db.execute(select(ArchivedTask).where(ArchivedTask.id == task_id, ArchivedTask.project_id == project_id, archived_project_is_live))
+    archived = result.scalar_one_or_none()
+    if archived is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Archived task not found")
+    # Restored under its original id, which an older SQLite database may have handed out again.
+    collision = await db.execute(select(exists().where(Task.id == task_id)))
+    if collision.scalar():
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail="A task with this id already exists")
+    
+    await restore_task(db, archived)
+    await db.commit()
+    await response_cache.invalidate(f"project:{project_id}:tasks")
+    activity_log.record("task.restored", "task", task_id, project_id=project_id, actor_id=current_user.id)
+    result = await db.execute(select(Task).where(Task.id == task_id))
+    return result.scalar_one()
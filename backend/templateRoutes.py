@@ -0,0 +1,91 @@
+from fastapi import APIRouter, Depends, HTTPException, status
+from sqlalchemy import select, delete, exists
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import selectinload
+from database import get_db
+from models import Project, ProjectMember, ProjectTemplate, User
+from typing import List
+from auth import get_current_user_with_db
+from activity import activity_log
+from cloning import save_template_tasks, save_template_members, instantiate_template_tasks, instantiate_template_members
+from schemas import TemplateCreate, TemplateResponse, ProjectCloneOptions, ProjectCloneResponse
+
+router = APIRouter()
+
+@router.post("/", response_model=TemplateResponse, status_code=status.HTTP_201_CREATED)
+async def create_template(template_data: TemplateCreate, db: AsyncSession = Depends(get_db), current_user: User = Depends(get_current_user_with_db)):
+    # Check the project exists and the user is owner or member
+    access_result = await db.execute(
+        select(
+            Project.owner_id,
+            exists().where(ProjectMember.project_id == template_data.project_id, ProjectMember.user_id == current_user.id)
+        ).where(Project.id == template_data.project_id, Project.deleted_at.is_(None))
+    )
+    access = access_result.one_or_none()
+    if access is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Project not found")
+    owner_id, is_member = access
+    if owner_id != current_user.id and not is_member:
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Not authorized to use this project as a template")
+
+    template = ProjectTemplate(owner_id=current_user.id, name=template_data.name, description=template_data.description)
+    db.add(template)
+    await db.flush()
+    task_count = await save_template_tasks(db, template_data.project_id, template.id, template_data.include_members)
+    member_count = 0
+    if template_data.include_members:
+        member_count = await save_template_members(db, template_data.project_id, template.id, current_user.id, owner_id)
+    await db.commit()
+
+    response = TemplateResponse.model_validate(template)
+    response.task_count = task_count
+    response.member_count = member_count
+    return response
+
+@router.get("/", response_model=List[TemplateResponse])
+async def list_templates(db: AsyncSession = Depends(get_db), current_user: User = Depends(get_current_user_with_db)):
+    result = await db.execute(select(ProjectTemplate).where(ProjectTemplate.owner_id == current_user.id).order_by(ProjectTemplate.id))
+    templates = result.scalars().all()
+    return templates
+
+@router.delete("/{template_id}", status_code=status.HTTP_204_NO_CONTENT)
+async def delete_template(template_id: int, db: AsyncSession = Depends(get_db), current_user: User = Depends(get_current_user_with_db)):
+    result = await db.execute(select(ProjectTemplate).where(ProjectTemplate.id == template_id))
+    template = result.scalar_one_or_none()
+    if template is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Template not found")
+    if template.owner_id != current_user.id:
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Not authorized to delete this template")
+
+    # Template tasks and members go with it through ON DELETE CASCADE.
+    await db.execute(delete(ProjectTemplate).where(ProjectTemplate.id == template_id))
+    await db.commit()
+
+@router.post("/{template_id}/projects", response_model=ProjectCloneResponse, status_code=status.HTTP_201_CREATED)
+async def create_project_from_template(template_id: int, options: ProjectCloneOptions, db: AsyncSession = Depends(get_db), current_user: User = Depends(get_current_user_with_db)):
+    result = await db.execute(select(ProjectTemplate).where(ProjectTemplate.id == template_id))
+    template = result.scalar_one_or_none()
+    if template is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Template not found")
+    if template.owner_id != current_user.id:
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Not authorized to use this template")
+
+    new_project = Project(
+        owner_id=current_user.id,
+        name=options.name or template.name,
+        description=options.description if options.description is not None else template.description
+    )
+    db.add(new_project)
+    await db.flush()
+    task_count = 0
+    member_count = 0
+    # Members first: created tasks keep only assignees who can access the new project.
+    if options.include_members:
+        member_count = await instantiate_template_members(db, template_id, new_project.id, current_user.id)
+    if options.include_tasks:
+        task_count = await instantiate_template_tasks(db, template_id, new_project.id, current_user.id, options.include_members, options.reset_status)
+    await db.commit()
+    activity_log.record("project.created", "project", new_project.id, project_id=new_project.id, actor_id=current_user.id, details={"template_id": template_id, "tasks": task_count, "members": member_count})
+
+    result = await db.execute(select(Project).options(selectinload(Project.owner)).where(Project.id == new_project.id))
+    return ProjectCloneResponse(project=result.scalar_one(), task_count=task_count, member_count=member_count)
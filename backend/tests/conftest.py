@@ -0,0 +1,57 @@
+"""
+Runs the whole app in-process against a throwaway SQLite database
+(DATABASE_URL=sqlite://, see database.py), no server or Postgres needed:
+
+    cd backend && python -m pytest tests
+"""
+import asyncio
+import os
+import sys
+import uuid
+
+import httpx
+import pytest
+
+# Before anything imports database.py. Never point the tests at a real database.
+os.environ["DATABASE_URL"] = "sqlite://"
+os.environ.setdefault("SQL_ECHO", "false")
+os.environ.setdefault("PURGE_BATCH_SIZE", "2")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from main import app
+from purger import purger
+
+
+@pytest.fixture
+def anyio_backend():
+    return "asyncio"
+
+
+@pytest.fixture
+async def client():
+    async with app.router.lifespan_context(app):
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test") as client:
+            yield client
+
+
+@pytest.fixture
+def register(client):
+    """Register a fresh user; returns (user_id, auth headers)."""
+    async def register(name: str = "user"):
+        username = f"{name}-{uuid.uuid4().hex[:8]}"
+        response = await client.post("/users/register", json={"name": name, "username": username, "email": f"{username}@example.com", "password": "secret"})
+        assert response.status_code == 201
+        body = response.json()
+        return body["user_id"], {"Authorization": f"Bearer {body['access_token']}"}
+    return register
+
+
+async def wait_for_purge(entity: str, entity_id: int, timeout: float = 5.0):
+    """Wait until the background purger has finished with (entity, entity_id)."""
+    for _ in range(int(timeout / 0.05)):
+        job = purger.jobs.get((entity, entity_id))
+        if job is not None and job["status"] in ("done", "failed"):
+            assert job["status"] == "done"
+            return job
+        await asyncio.sleep(0.05)
+    raise AssertionError(f"purge of {entity} {entity_id} did not finish")
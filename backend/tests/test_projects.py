@@ -0,0 +1,78 @@
+import pytest
+
+pytestmark = pytest.mark.anyio
+
+
+async def create_project_with_tasks(client, owner_headers, member_id):
+    project_id = (await client.post("/projects/", json={"name": "Source", "description": "d"}, headers=owner_headers)).json()["id"]
+    await client.post(f"/projects/{project_id}/members", json={"user_id": member_id, "role": "admin"}, headers=owner_headers)
+    task_id = (await client.post(f"/tasks/{project_id}/tasks/", json={"title": "Member's", "assignee_id": member_id}, headers=owner_headers)).json()["id"]
+    await client.put(f"/tasks/{project_id}/tasks/{task_id}", json={"status": "Done"}, headers=owner_headers)
+    await client.post(f"/tasks/{project_id}/tasks/", json={"title": "Unassigned"}, headers=owner_headers)
+    return project_id
+
+
+async def task_summary(client, project_id):
+    tasks = (await client.get(f"/tasks/{project_id}/tasks/")).json()
+    return sorted((t["title"], t["status"], t["assignee_id"]) for t in tasks)
+
+
+async def test_clone_by_member_keeps_source_owner(client, register):
+    owner_id, owner_headers = await register("owner")
+    member_id, member_headers = await register("member")
+    project_id = await create_project_with_tasks(client, owner_headers, member_id)
+
+    response = await client.post(f"/projects/{project_id}/clone", json={}, headers=member_headers)
+    assert response.status_code == 201
+    body = response.json()
+    clone_id = body["project"]["id"]
+    assert body["project"]["name"] == "Source (copy)"
+    assert body["project"]["owner_id"] == member_id
+    assert (body["task_count"], body["member_count"]) == (2, 1)
+    # reset_status defaults to true; the caller owns the clone and the source owner is a member of it.
+    assert await task_summary(client, clone_id) == [("Member's", "To Do", member_id), ("Unassigned", "To Do", None)]
+    assert (await client.get(f"/projects/{clone_id}/bootstrap", headers=owner_headers)).status_code == 200
+
+
+async def test_clone_without_members_clears_assignees(client, register):
+    owner_id, owner_headers = await register("owner")
+    member_id, member_headers = await register("member")
+    project_id = await create_project_with_tasks(client, owner_headers, member_id)
+
+    response = await client.post(f"/projects/{project_id}/clone", json={"name": "Solo", "include_members": False, "reset_status": False}, headers=owner_headers)
+    body = response.json()
+    assert (body["project"]["name"], body["member_count"]) == ("Solo", 0)
+    assert await task_summary(client, body["project"]["id"]) == [("Member's", "Done", None), ("Unassigned", "To Do", None)]
+    assert (await client.get(f"/projects/{body['project']['id']}/bootstrap", headers=member_headers)).status_code == 403
+
+
+async def test_clone_requires_access(client, register):
+    owner_id, owner_headers = await register("owner")
+    member_id, _ = await register("member")
+    other_id, other_headers = await register("other")
+    project_id = await create_project_with_tasks(client, owner_headers, member_id)
+    assert (await client.post(f"/projects/{project_id}/clone", json={}, headers=other_headers)).status_code == 403
+
+
+async def test_template_round_trip(client, register):
+    owner_id, owner_headers = await register("owner")
+    member_id, member_headers = await register("member")
+    project_id = await create_project_with_tasks(client, owner_headers, member_id)
+
+    response = await client.post("/templates/", json={"project_id": project_id, "name": "Template"}, headers=owner_headers)
+    assert response.status_code == 201
+    template = response.json()
+    assert (template["task_count"], template["member_count"]) == (2, 1)
+    assert [t["id"] for t in (await client.get("/templates/", headers=owner_headers)).json()] == [template["id"]]
+    assert (await client.get("/templates/", headers=member_headers)).json() == []
+
+    response = await client.post(f"/templates/{template['id']}/projects", json={"reset_status": False}, headers=owner_headers)
+    assert response.status_code == 201
+    body = response.json()
+    assert (body["project"]["name"], body["task_count"], body["member_count"]) == ("Template", 2, 1)
+    assert await task_summary(client, body["project"]["id"]) == [("Member's", "Done", member_id), ("Unassigned", "To Do", None)]
+    assert (await client.get(f"/projects/{body['project']['id']}/bootstrap", headers=member_headers)).status_code == 200
+
+    assert (await client.post(f"/templates/{template['id']}/projects", json={}, headers=member_headers)).status_code == 403
+    assert (await client.delete(f"/templates/{template['id']}", headers=owner_headers)).status_code == 204
+    assert (await client.post(f"/templates/{template['id']}/projects", json={}, headers=owner_headers)).status_code == 404
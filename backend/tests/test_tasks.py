@@ -0,0 +1,89 @@
+import asyncio
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import insert
+
+from archiver import archive_batch
+from database import AsyncSessionLocal
+from models import Task, TaskStatus
+from reminders import ReminderScheduler, REMINDER, OVERDUE
+
+pytestmark = pytest.mark.anyio
+
+
+async def archive_done_tasks():
+    async with AsyncSessionLocal() as db:
+        return await archive_batch(db, datetime.utcnow() + timedelta(seconds=1))
+
+
+async def test_archive_and_restore(client, register):
+    user_id, headers = await register("owner")
+    project_id = (await client.post("/projects/", json={"name": "P"}, headers=headers)).json()["id"]
+    done_id = (await client.post(f"/tasks/{project_id}/tasks/", json={"title": "Done"}, headers=headers)).json()["id"]
+    open_id = (await client.post(f"/tasks/{project_id}/tasks/", json={"title": "Open"}, headers=headers)).json()["id"]
+    await client.put(f"/tasks/{project_id}/tasks/{done_id}", json={"status": "Done"}, headers=headers)
+
+    assert await archive_done_tasks() >= 1
+    assert [t["id"] for t in (await client.get(f"/tasks/{project_id}/tasks/")).json()] == [open_id]
+    assert [t["id"] for t in (await client.get(f"/tasks/{project_id}/archived/", headers=headers)).json()] == [done_id]
+
+    response = await client.post(f"/tasks/{project_id}/archived/{done_id}/restore", headers=headers)
+    assert response.status_code == 200
+    assert response.json()["status"] == "Done"
+    assert sorted(t["id"] for t in (await client.get(f"/tasks/{project_id}/tasks/")).json()) == [done_id, open_id]
+    assert (await client.get(f"/tasks/{project_id}/archived/", headers=headers)).json() == []
+
+
+async def test_archived_routes_require_membership(client, register):
+    owner_id, owner_headers = await register("owner")
+    other_id, other_headers = await register("other")
+    project_id = (await client.post("/projects/", json={"name": "P"}, headers=owner_headers)).json()["id"]
+    task_id = (await client.post(f"/tasks/{project_id}/tasks/", json={"title": "Done"}, headers=owner_headers)).json()["id"]
+    await client.put(f"/tasks/{project_id}/tasks/{task_id}", json={"status": "Done"}, headers=owner_headers)
+    await archive_done_tasks()
+
+    assert (await client.get(f"/tasks/{project_id}/archived/", headers=other_headers)).status_code == 403
+    assert (await client.post(f"/tasks/{project_id}/archived/{task_id}/restore", headers=other_headers)).status_code == 403
+
+
+async def test_restore_conflict_returns_409(client, register):
+    user_id, headers = await register("owner")
+    project_id = (await client.post("/projects/", json={"name": "P"}, headers=headers)).json()["id"]
+    task_id = (await client.post(f"/tasks/{project_id}/tasks/", json={"title": "Done"}, headers=headers)).json()["id"]
+    await client.put(f"/tasks/{project_id}/tasks/{task_id}", json={"status": "Done"}, headers=headers)
+    await archive_done_tasks()
+    # What an older database that reused ids could contain.
+    async with AsyncSessionLocal() as db:
+        await db.execute(insert(Task).values(id=task_id, title="Squatter", status=TaskStatus.TODO, project_id=project_id))
+        await db.commit()
+
+    assert (await client.post(f"/tasks/{project_id}/archived/{task_id}/restore", headers=headers)).status_code == 409
+
+
+async def test_overdue_hides_projects_the_user_left(client, register):
+    owner_id, owner_headers = await register("owner")
+    user_id, headers = await register("member")
+    project_id = (await client.post("/projects/", json={"name": "P"}, headers=owner_headers)).json()["id"]
+    member = (await client.post(f"/projects/{project_id}/members", json={"user_id": user_id, "role": "member"}, headers=owner_headers)).json()
+    await client.post(f"/tasks/{project_id}/tasks/", json={"title": "Late", "assignee_id": user_id, "due_at": "2020-01-01T00:00:00"}, headers=owner_headers)
+    assert len((await client.get("/tasks/overdue", headers=headers)).json()) == 1
+
+    await client.delete(f"/projects/{project_id}/members/{member['id']}", headers=owner_headers)
+    assert (await client.get("/tasks/overdue", headers=headers)).json() == []
+
+
+def test_rescheduling_same_due_at_queues_once():
+    scheduler = ReminderScheduler(None, window=timedelta(hours=1), lead=timedelta(minutes=10))
+    now = datetime.utcnow()
+    scheduler._window_start, scheduler._window_end = now, now + timedelta(hours=1)
+    scheduler._wakeup = asyncio.Event()
+    due_at = now + timedelta(minutes=30)
+
+    scheduler.schedule(1, due_at)
+    scheduler.schedule(1, due_at)
+    assert sorted((task_id, kind) for _, task_id, kind, _ in scheduler._heap) == [(1, OVERDUE), (1, REMINDER)]
+
+    # A new due date queues a new pair; the old entries are dropped when they fire.
+    scheduler.schedule(1, due_at + timedelta(minutes=5))
+    assert len(scheduler._heap) == 4
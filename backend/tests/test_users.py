@@ -0,0 +1,71 @@
+import pytest
+from conftest import wait_for_purge
+
+pytestmark = pytest.mark.anyio
+
+
+async def test_purged_user_id_is_not_reused(client, register):
+    user_id, headers = await register("alice")
+    response = await client.post("/projects/", json={"name": "Alice's"}, headers=headers)
+    project_id = response.json()["id"]
+
+    assert (await client.delete(f"/users/{user_id}", headers=headers)).status_code == 204
+    job = await wait_for_purge("user", user_id)
+    assert job["deleted"]["projects"] == 1
+
+    new_user_id, new_headers = await register("victim")
+    assert new_user_id > user_id
+    # The deleted user's token must not resolve to anyone.
+    assert (await client.post("/users/me", headers=headers)).status_code == 401
+    response = await client.post("/projects/", json={"name": "Victim's"}, headers=new_headers)
+    assert response.json()["id"] > project_id
+
+
+async def test_purge_unassigns_tasks_in_other_projects(client, register):
+    owner_id, owner_headers = await register("owner")
+    user_id, headers = await register("leaver")
+    project_id = (await client.post("/projects/", json={"name": "P"}, headers=owner_headers)).json()["id"]
+    await client.post(f"/projects/{project_id}/members", json={"user_id": user_id, "role": "member"}, headers=owner_headers)
+    await client.post(f"/tasks/{project_id}/tasks/", json={"title": "T", "assignee_id": user_id}, headers=owner_headers)
+    # Cache the task list before the purge.
+    assert [t["assignee_id"] for t in (await client.get(f"/tasks/{project_id}/tasks/")).json()] == [user_id]
+
+    await client.delete(f"/users/{user_id}", headers=headers)
+    await wait_for_purge("user", user_id)
+
+    assert [t["assignee_id"] for t in (await client.get(f"/tasks/{project_id}/tasks/")).json()] == [None]
+    assert (await client.get(f"/projects/{project_id}/members", headers=owner_headers)).json() == []
+
+
+async def test_rename_drops_cached_responses(client, register):
+    owner_id, owner_headers = await register("owner")
+    member_id, member_headers = await register("member")
+    project_id = (await client.post("/projects/", json={"name": "P"}, headers=owner_headers)).json()["id"]
+    await client.post(f"/projects/{project_id}/members", json={"user_id": member_id, "role": "member"}, headers=owner_headers)
+    await client.post(f"/tasks/{project_id}/tasks/", json={"title": "T", "assignee_id": member_id}, headers=owner_headers)
+
+    urls = {
+        "project": f"/projects/{project_id}?expand=owner",
+        "members": f"/projects/{project_id}/members",
+        "tasks": f"/tasks/{project_id}/tasks/?expand=assignee",
+    }
+
+    def names(responses):
+        return (
+            responses["project"]["owner"]["name"],
+            responses["members"][0]["user"]["name"],
+            responses["tasks"][0]["assignee"]["name"],
+        )
+
+    async def fetch():
+        return {key: (await client.get(url, headers=owner_headers)).json() for key, url in urls.items()}
+
+    await fetch()
+    assert names(await fetch()) == ("owner", "member", "member")
+
+    for user_id, headers, name in ((owner_id, owner_headers, "Renamed owner"), (member_id, member_headers, "Renamed member")):
+        me = (await client.post("/users/me", headers=headers)).json()
+        response = await client.put(f"/users/{user_id}", json={"name": name, "username": me["username"], "email": me["email"], "password": "secret"}, headers=headers)
+        assert response.status_code == 200
+
+    assert names(await fetch()) == ("Renamed owner", "Renamed member", "Renamed member")
@@ -1,11 +1,14 @@
 from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy import select
+from sqlalchemy import select, update
+from datetime import datetime
 from sqlalchemy.ext.asyncio import AsyncSession
 from database import get_db
-from models import User
+from models import User, Project
 from typing import List
 from auth import get_password_hash, verify_password, create_access_token, get_current_user_with_db
 from schemas import UserCreate, UserResponse, UserLogin
+from cache import response_cache
+from purger import purger
 
 router = APIRouter()
 
@@ -32,7 +35,7 @@ async def register_user(user_data: UserCreate, db:AsyncSession=Depends(get_db)):
 
 @router.post("/login")
 async def login_user(user_data: UserLogin, db:AsyncSession=Depends(get_db)):
-    result = await db.execute(select(User).where(User.username == user_data.username))
+    result = await db.execute(select(User).where(User.username == user_data.username, User.deleted_at.is_(None)))
     existing_user = result.scalar_one_or_none()
     if existing_user is None or not verify_password(user_data.password, existing_user.password):
         raise HTTPException(
@@ -55,24 +58,30 @@ async def get_current_user_with_info(current_user: User = Depends(get_current_us
 
 @router.get("/", response_model=List[UserResponse])
 async def get_all_users(db: AsyncSession = Depends(get_db)):
-    result = await db.execute(select(User))
+    result = await db.execute(select(User).where(User.deleted_at.is_(None)))
     users = result.scalars().all()
     return users
 
 @router.get("/{user_id}", response_model=UserResponse)
 async def get_user_by_id(user_id: int, db: AsyncSession = Depends(get_db)):
-    result = await db.execute(select(User).where(User.id == user_id))
+    cache_key = f"user:{user_id}"
+    cached = await response_cache.get(cache_key)
+    if cached is not None:
+        return cached
+    generation = await response_cache.generation()
+
+    result = await db.execute(select(User).where(User.id == user_id, User.deleted_at.is_(None)))
     user_obj = result.scalar_one_or_none()
     if user_obj is None:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="User not found")
-    return user_obj
+    return await response_cache.put(cache_key, UserResponse, user_obj, [f"user:{user_id}"], generation)
 
 @router.put("/{user_id}", response_model=UserResponse)
 async def update_user(user_id: int, user_data: UserCreate, db: AsyncSession = Depends(get_db), current_user: User = Depends(get_current_user_with_db)):
     if current_user.id != user_id:
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Not authorized to update this user")
     
-    result = await db.execute(select(User).where(User.id == user_id))
+    result = await db.execute(select(User).where(User.id == user_id, User.deleted_at.is_(None)))
     user_obj = result.scalar_one_or_none()
     if user_obj is None:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="User not found")
@@ -91,6 +100,7 @@ async def update_user(user_id: int, user_data: UserCreate, db: AsyncSession = De
             setattr(user_obj, key, value)
 
     await db.commit()
+    await response_cache.invalidate(f"user:{user_id}")
     await db.refresh(user_obj)
     return user_obj
 
@@ -99,13 +109,26 @@ async def delete_user(user_id: int, db: AsyncSession = Depends(get_db), current_
     if current_user.id != user_id:
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Not authorized to delete this user")
     
-    result = await db.execute(select(User).where(User.id == user_id))
+    result = await db.execute(select(User).where(User.id == user_id, User.deleted_at.is_(None)))
     user_obj = result.scalar_one_or_none()
     if user_obj is None:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="User not found")
     
-    await db.delete(user_obj)
+    # Mark the user and their projects deleted and return; purger.py removes the rows
+    # (memberships, owned projects and their tasks) in batches in the background.
+    now = datetime.utcnow()
+    user_obj.deleted_at = now
+    owned_result = await db.execute(
+        update(Project)
+        .where(Project.owner_id == user_id, Project.deleted_at.is_(None))
+        .values(deleted_at=now)
+        .returning(Project.id)
+    )
+    owned_ids = owned_result.scalars().all()
     await db.commit()
+    # Projects the user owned or belonged to are tagged with the user as well.
+    await response_cache.invalidate(f"user:{user_id}", *[f"project:{project_id}:tasks" for project_id in owned_ids])
+    purger.enqueue("user", user_id, user_id)
     return None
 
 
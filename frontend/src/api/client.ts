@@ -114,6 +114,14 @@ class ApiClient {
     return this.request(`/projects/${projectId}`);
   }
 
+  async getProjectBootstrap(projectId: number) {
+    return this.request(`/projects/${projectId}/bootstrap`);
+  }
+
+  async getProjectTasks(projectId: number) {
+    return this.request(`/tasks/${projectId}/tasks/`);
+  }
+
   async updateProject(projectId: number, data: Record<string, any>) {
     return this.request(`/projects/${projectId}`, "PUT", data);
   }
@@ -190,8 +198,8 @@ class ApiClient {
 
   async getMyTasks(statusFilter?: string) {
     const endpoint = statusFilter
-      ? `/tasks/my-tasks?status_filter=${statusFilter}`
-      : "/tasks/my-tasks";
+      ? `/tasks/mine?status_filter=${encodeURIComponent(statusFilter)}`
+      : "/tasks/mine";
     return this.request(endpoint);
   }
 }
@@ -36,6 +36,8 @@ export const ProjectDetailPage: React.FC = () => {
   const [project, setProject] = useState<Project | null>(null);
   const [tasks, setTasks] = useState<Task[]>([]);
   const [members, setMembers] = useState<Member[]>([]);
+  const [taskCounts, setTaskCounts] = useState<Record<string, number>>({});
+  const [hasMoreTasks, setHasMoreTasks] = useState(false);
   const [loading, setLoading] = useState(true);
   const [error, setError] = useState("");
   const [showCreateTaskModal, setShowCreateTaskModal] = useState(false);
@@ -52,14 +54,21 @@ export const ProjectDetailPage: React.FC = () => {
   const fetchProjectDetails = async () => {
     try {
       setLoading(true);
-      const data = await apiClient.getProject(parseInt(projectId!));
-      setProject(data);
-      if (data.members) {
-        setMembers(data.members);
-      }
-      if (data.tasks) {
-        setTasks(data.tasks);
-      }
+      // One round trip for project, members and the first page of tasks.
+      const data = await apiClient.getProjectBootstrap(parseInt(projectId!));
+      setProject(data.project);
+      setMembers(
+        data.members.map((m: any) => ({
+          id: m.id,
+          username: m.user.username,
+          name: m.user.name,
+          role: m.role,
+        }))
+      );
+      setTasks(data.tasks);
+      setTaskCounts(data.task_counts);
+      // Large projects show the first page with totals; the rest loads on "Load all".
+      setHasMoreTasks(data.has_more_tasks);
     } catch (err: any) {
       setError(err.message || "Failed to load project");
     } finally {
@@ -67,6 +76,21 @@ export const ProjectDetailPage: React.FC = () => {
     }
   };
 
+  const fetchRemainingTasks = async () => {
+    try {
+      const allTasks = await apiClient.getProjectTasks(parseInt(projectId!));
+      setTasks(allTasks);
+      setHasMoreTasks(false);
+    } catch (err: any) {
+      setError(err.message || "Failed to load remaining tasks");
+    }
+  };
+
+  const countTasks = (status: string) =>
+    hasMoreTasks
+      ? taskCounts[status] ?? 0
+      : tasks.filter((t) => t.status === status).length;
+
   const handleCreateTask = async (e: React.FormEvent) => {
     e.preventDefault();
     setError("");
@@ -166,12 +190,25 @@ export const ProjectDetailPage: React.FC = () => {
                 )}
               </div>
 
+              {hasMoreTasks && (
+                <p className="text-sm text-gray-600 mb-4">
+                  Showing {tasks.length} of{" "}
+                  {Object.values(taskCounts).reduce((a, b) => a + b, 0)} tasks.{" "}
+                  <button
+                    onClick={fetchRemainingTasks}
+                    className="text-blue-500 hover:underline"
+                  >
+                    Load all
+                  </button>
+                </p>
+              )}
+
               {/* Task Columns */}
               <div className="grid grid-cols-1 md:grid-cols-3 gap-4">
                 {["To Do", "In Progress", "Done"].map((status) => (
                   <div key={status} className="bg-gray-100 rounded-lg p-4">
                     <h3 className="font-semibold text-gray-800 mb-4">
-                      {status}
+                      {status} ({countTasks(status)})
                     </h3>
                     <div className="space-y-3">
                       {tasks